@@ -1,5 +1,27 @@
-"""Configuration module for Korean Investment & Securities trading"""
+"""
+Configuration module for Korean Investment & Securities trading
 
-from .settings import settings, Settings, APIConfig, WebSocketConfig, TradingConfig
+``config.settings`` is the global Settings instance, not the
+``config/settings.py`` submodule it shadows: use ``config.Settings`` (or
+``from config.settings import Settings``) to reach the class.
+"""
 
-__all__ = ['settings', 'Settings', 'APIConfig', 'WebSocketConfig', 'TradingConfig']
\ No newline at end of file
+from typing import Any
+
+from .settings import Settings, APIConfig, WebSocketConfig, TradingConfig
+
+# Importing the submodule binds it as ``config.settings``; drop that binding
+# so the global settings instance is resolved lazily by ``__getattr__``.
+del settings  # type: ignore[name-defined]
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve the global settings instance on first access (PEP 562)"""
+    if name == "settings":
+        from .settings import settings as instance
+        globals()["settings"] = instance
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['settings', 'Settings', 'APIConfig', 'WebSocketConfig', 'TradingConfig']
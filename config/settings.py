@@ -6,12 +6,19 @@ Configuration settings and environment management.
 """
 
 import os
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+import sys
+from typing import Dict, Any, Mapping, Optional, Set, Tuple
+from dataclasses import dataclass, fields, replace
 from pathlib import Path
 
 
-@dataclass
+# Config objects are immutable; __slots__ is only supported on Python 3.10+
+_DATACLASS_OPTIONS: Dict[str, Any] = {"frozen": True}
+if sys.version_info >= (3, 10):
+    _DATACLASS_OPTIONS["slots"] = True
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class APIConfig:
     """API configuration settings"""
     app_key: str
@@ -27,7 +34,7 @@ class APIConfig:
             raise ValueError("app_key and app_secret are required")
 
 
-@dataclass  
+@dataclass(**_DATACLASS_OPTIONS)
 class WebSocketConfig:
     """WebSocket configuration settings"""
     ping_interval: int = 30
@@ -36,7 +43,7 @@ class WebSocketConfig:
     message_timeout: int = 60
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class TradingConfig:
     """Trading strategy configuration"""
     max_position_size: float = 0.1  # 10% of portfolio per position
@@ -53,6 +60,10 @@ class TradingConfig:
     lookback_period: int = 20       # Days for technical indicators
     rebalance_frequency: str = "1H" # Rebalancing frequency
     
+    def __post_init__(self):
+        """Validate configuration after initialization"""
+        self.validate()
+    
     def validate(self):
         """Validate trading configuration"""
         if self.max_position_size <= 0 or self.max_position_size > 1:
@@ -63,9 +74,111 @@ class TradingConfig:
             raise ValueError("take_profit_pct must be positive")
 
 
+# Field names of each config section, resolved once for Settings.to_dict
+_API_FIELDS = tuple(f.name for f in fields(APIConfig))
+_WEBSOCKET_FIELDS = tuple(f.name for f in fields(WebSocketConfig))
+_TRADING_FIELDS = tuple(f.name for f in fields(TradingConfig))
+
+
+# Environment variables read by Settings._load_config
+_ENV_KEYS = (
+    "KIS_APP_KEY", "KIS_APP_SECRET", "KIS_ACCOUNT_NUMBER", "KIS_MOCK_MODE",
+    "KIS_TIMEOUT", "KIS_MAX_RETRIES",
+    "KIS_WS_PING_INTERVAL", "KIS_WS_MAX_RECONNECTS", "KIS_WS_RECONNECT_DELAY",
+    "KIS_WS_MESSAGE_TIMEOUT",
+    "KIS_MAX_POSITION_SIZE", "KIS_STOP_LOSS_PCT", "KIS_TAKE_PROFIT_PCT",
+    "KIS_MAX_DAILY_LOSS", "KIS_RISK_FREE_RATE", "KIS_DEFAULT_ORDER_TYPE",
+    "KIS_MIN_ORDER_AMOUNT", "KIS_LOOKBACK_PERIOD", "KIS_REBALANCE_FREQUENCY",
+    "KIS_LOG_LEVEL", "KIS_LOG_FORMAT", "KIS_LOG_FILE", "KIS_LOG_MAX_SIZE",
+    "KIS_LOG_BACKUP_COUNT",
+    "DATABASE_URL", "DB_ECHO",
+)
+
+# Configuration sections keyed by the environment snapshot they came from
+_config_cache: Dict[Tuple[Optional[str], ...], Tuple[Any, ...]] = {}
+
+# (mtime_ns, size) of env files already applied by Settings.from_env_file
+_env_file_stats: Dict[str, Tuple[int, int]] = {}
+
+# Variables set from env files; unlike pre-existing ones, a reload updates them
+_env_file_keys: Set[str] = set()
+
+
+def _env_snapshot() -> Tuple[Optional[str], ...]:
+    """Current values of the environment variables used by Settings"""
+    env = os.environ
+    return tuple(env.get(key) for key in _ENV_KEYS)
+
+
+def _parse_env(env: Mapping[str, str]) -> Dict[str, Dict[str, Any]]:
+    """Parse configuration values from an environment mapping"""
+    def _s(key: str, default: str) -> str:
+        return env.get(key) or default
+    
+    def _i(key: str, default: int) -> int:
+        value = env.get(key)
+        return int(value) if value else default
+    
+    def _f(key: str, default: float) -> float:
+        value = env.get(key)
+        return float(value) if value else default
+    
+    def _b(key: str, default: bool) -> bool:
+        value = env.get(key)
+        return value.lower() == "true" if value else default
+    
+    return {
+        "api": {
+            "app_key": _s("KIS_APP_KEY", ""),
+            "app_secret": _s("KIS_APP_SECRET", ""),
+            "account_number": _s("KIS_ACCOUNT_NUMBER", ""),
+            "is_mock": _b("KIS_MOCK_MODE", True),
+            "timeout": _i("KIS_TIMEOUT", 30),
+            "max_retries": _i("KIS_MAX_RETRIES", 3),
+        },
+        "websocket": {
+            "ping_interval": _i("KIS_WS_PING_INTERVAL", 30),
+            "max_reconnect_attempts": _i("KIS_WS_MAX_RECONNECTS", 5),
+            "reconnect_delay": _i("KIS_WS_RECONNECT_DELAY", 5),
+            "message_timeout": _i("KIS_WS_MESSAGE_TIMEOUT", 60),
+        },
+        "trading": {
+            "max_position_size": _f("KIS_MAX_POSITION_SIZE", 0.1),
+            "stop_loss_pct": _f("KIS_STOP_LOSS_PCT", -0.05),
+            "take_profit_pct": _f("KIS_TAKE_PROFIT_PCT", 0.10),
+            "max_daily_loss": _f("KIS_MAX_DAILY_LOSS", -0.02),
+            "risk_free_rate": _f("KIS_RISK_FREE_RATE", 0.03),
+            "default_order_type": _s("KIS_DEFAULT_ORDER_TYPE", "01"),
+            "min_order_amount": _i("KIS_MIN_ORDER_AMOUNT", 10000),
+            "lookback_period": _i("KIS_LOOKBACK_PERIOD", 20),
+            "rebalance_frequency": _s("KIS_REBALANCE_FREQUENCY", "1H"),
+        },
+        "logging": {
+            "level": _s("KIS_LOG_LEVEL", "INFO"),
+            "format": _s("KIS_LOG_FORMAT",
+                         "%(asctime)s - %(name)s - %(levelname)s - %(message)s"),
+            "file": _s("KIS_LOG_FILE", "kis_trading.log"),
+            "max_size": _i("KIS_LOG_MAX_SIZE", 10485760),  # 10MB
+            "backup_count": _i("KIS_LOG_BACKUP_COUNT", 5),
+        },
+        # Database Configuration (for future use)
+        "database": {
+            "url": _s("DATABASE_URL", "sqlite:///kis_trading.db"),
+            "echo": _b("DB_ECHO", False),
+        },
+    }
+
+
 class Settings:
     """Main settings manager"""
     
+    # Sections that update_config can change
+    _SECTIONS = {
+        "api": APIConfig,
+        "websocket": WebSocketConfig,
+        "trading": TradingConfig,
+    }
+    
     def __init__(self, config_file: Optional[str] = None):
         """
         Initialize settings
@@ -78,82 +191,54 @@ class Settings:
     
     def _load_config(self):
         """Load configuration from environment or config file"""
-        # API Configuration
-        self.api = APIConfig(
-            app_key=os.getenv("KIS_APP_KEY", ""),
-            app_secret=os.getenv("KIS_APP_SECRET", ""), 
-            account_number=os.getenv("KIS_ACCOUNT_NUMBER", ""),
-            is_mock=os.getenv("KIS_MOCK_MODE", "true").lower() == "true",
-            timeout=int(os.getenv("KIS_TIMEOUT", "30")),
-            max_retries=int(os.getenv("KIS_MAX_RETRIES", "3"))
-        )
+        # Snapshot the relevant environment once; identical snapshots reuse
+        # the previously parsed values instead of re-parsing every variable.
+        snapshot = _env_snapshot()
+        sections = _config_cache.get(snapshot)
+        if sections is None:
+            values = _parse_env(os.environ)
+            # Frozen config objects validate on construction and can be shared
+            sections = (
+                APIConfig(**values["api"]),
+                WebSocketConfig(**values["websocket"]),
+                TradingConfig(**values["trading"]),
+                values["logging"],
+                values["database"],
+            )
+            _config_cache[snapshot] = sections
         
-        # WebSocket Configuration
-        self.websocket = WebSocketConfig(
-            ping_interval=int(os.getenv("KIS_WS_PING_INTERVAL", "30")),
-            max_reconnect_attempts=int(os.getenv("KIS_WS_MAX_RECONNECTS", "5")),
-            reconnect_delay=int(os.getenv("KIS_WS_RECONNECT_DELAY", "5")),
-            message_timeout=int(os.getenv("KIS_WS_MESSAGE_TIMEOUT", "60"))
-        )
-        
-        # Trading Configuration
-        self.trading = TradingConfig(
-            max_position_size=float(os.getenv("KIS_MAX_POSITION_SIZE", "0.1")),
-            stop_loss_pct=float(os.getenv("KIS_STOP_LOSS_PCT", "-0.05")),
-            take_profit_pct=float(os.getenv("KIS_TAKE_PROFIT_PCT", "0.10")),
-            max_daily_loss=float(os.getenv("KIS_MAX_DAILY_LOSS", "-0.02")),
-            risk_free_rate=float(os.getenv("KIS_RISK_FREE_RATE", "0.03")),
-            default_order_type=os.getenv("KIS_DEFAULT_ORDER_TYPE", "01"),
-            min_order_amount=int(os.getenv("KIS_MIN_ORDER_AMOUNT", "10000")),
-            lookback_period=int(os.getenv("KIS_LOOKBACK_PERIOD", "20")),
-            rebalance_frequency=os.getenv("KIS_REBALANCE_FREQUENCY", "1H")
-        )
-        
-        # Validate configurations
-        self.trading.validate()
+        self.api, self.websocket, self.trading, logging_config, database_config = sections
         
         # Logging Configuration
-        self.logging = {
-            "level": os.getenv("KIS_LOG_LEVEL", "INFO"),
-            "format": os.getenv("KIS_LOG_FORMAT", 
-                              "%(asctime)s - %(name)s - %(levelname)s - %(message)s"),
-            "file": os.getenv("KIS_LOG_FILE", "kis_trading.log"),
-            "max_size": int(os.getenv("KIS_LOG_MAX_SIZE", "10485760")),  # 10MB
-            "backup_count": int(os.getenv("KIS_LOG_BACKUP_COUNT", "5"))
-        }
+        self.logging = dict(logging_config)
         
         # Database Configuration (for future use)
-        self.database = {
-            "url": os.getenv("DATABASE_URL", "sqlite:///kis_trading.db"),
-            "echo": os.getenv("DB_ECHO", "false").lower() == "true"
-        }
+        self.database = dict(database_config)
     
     def update_config(self, section: str, **kwargs):
         """
         Update configuration section
         
         Args:
-            section: Configuration section name
+            section: Configuration section name (api, websocket or trading)
             **kwargs: Configuration values to update
+            
+        Raises:
+            ValueError: If the section is unknown or new values are invalid
+            TypeError: If a key is not a field of the section
         """
-        if hasattr(self, section):
-            config_obj = getattr(self, section)
-            for key, value in kwargs.items():
-                if hasattr(config_obj, key):
-                    setattr(config_obj, key, value)
-                    
-            # Re-validate if it's trading config
-            if section == "trading":
-                config_obj.validate()
-        else:
+        if section not in self._SECTIONS:
             raise ValueError(f"Unknown configuration section: {section}")
+        
+        # Config objects are frozen; swap in a re-validated copy
+        setattr(self, section, replace(getattr(self, section), **kwargs))
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert settings to dictionary"""
         return {
-            "api": self.api.__dict__,
-            "websocket": self.websocket.__dict__,
-            "trading": self.trading.__dict__,
+            "api": {name: getattr(self.api, name) for name in _API_FIELDS},
+            "websocket": {name: getattr(self.websocket, name) for name in _WEBSOCKET_FIELDS},
+            "trading": {name: getattr(self.trading, name) for name in _TRADING_FIELDS},
             "logging": self.logging,
             "database": self.database
         }
@@ -163,23 +248,47 @@ class Settings:
         """
         Load settings from environment file
         
+        Variables already set in the process environment before any env
+        file was loaded take precedence over values from the file; those
+        set from the file are updated when it changes. A file that is
+        unchanged since it was last applied is not parsed again.
+        
         Args:
             env_file: Path to environment file
             
         Returns:
             Settings: Configured settings instance
         """
-        env_path = Path(env_file)
-        if env_path.exists():
-            with open(env_path) as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith("#"):
-                        key, value = line.split("=", 1)
-                        os.environ[key.strip()] = value.strip()
-        
+        cls._apply_env_file(Path(env_file))
         return cls()
+    
+    @staticmethod
+    def _apply_env_file(env_path: Path):
+        """Copy variables from an env file into os.environ"""
+        try:
+            stat = env_path.stat()
+        except OSError:
+            return
+        
+        path_key = str(env_path.resolve())
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if _env_file_stats.get(path_key) != signature:
+            environ = os.environ
+            with open(env_path, buffering=65536) as f:
+                for line in f:
+                    key, sep, value = line.partition("=")
+                    key = key.strip()
+                    if not sep or not key or key.startswith("#"):
+                        continue
+                    if key in _env_file_keys or key not in environ:
+                        environ[key] = value.strip()
+                        _env_file_keys.add(key)
+            _env_file_stats[path_key] = signature
 
 
-# Global settings instance
-settings = Settings()
\ No newline at end of file
+def __getattr__(name: str) -> Any:
+    """Create the global settings instance on first access (PEP 562)"""
+    if name == "settings":
+        instance = globals()["settings"] = Settings()
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
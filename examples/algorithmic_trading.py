@@ -7,12 +7,15 @@ Advanced example showing algorithmic trading strategies with risk management.
 
 import asyncio
 import logging
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from collections import deque
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Tuple
 import time
 
+if TYPE_CHECKING:
+    import numpy as np
+    from korea_investment_trading.websocket import PriceTick
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -48,9 +51,22 @@ class SimpleMovingAverageStrategy:
         self.long_window = long_window
         self.symbol = symbol
         
-        # Price history storage
-        self.price_history: List[float] = []
+        # Price history storage (bounded; oldest prices are evicted on append)
         self.max_history = max(short_window, long_window) + 10
+        self.price_history: Deque[float] = deque(maxlen=self.max_history)
+        
+        # Running window sums for the latest and the previous tick
+        self._short_sum = 0.0
+        self._long_sum = 0.0
+        self._prev_short_sum = 0.0
+        self._prev_long_sum = 0.0
+        
+        # Ticks received, and the tick calculate_signals last evaluated
+        self._tick = 0
+        self._evaluated_tick = -1
+        
+        # Short MA minus long MA at the last evaluated tick
+        self._prev_delta = 0.0
         
         # Strategy state
         self.position = 0  # 0: No position, 1: Long, -1: Short
@@ -58,11 +74,20 @@ class SimpleMovingAverageStrategy:
         
     def add_price(self, price: float):
         """Add new price to history"""
-        self.price_history.append(price)
-        
-        # Keep only required history
-        if len(self.price_history) > self.max_history:
-            self.price_history = self.price_history[-self.max_history:]
+        history = self.price_history
+        self._prev_short_sum = self._short_sum
+        self._prev_long_sum = self._long_sum
+        
+        # Slide both windows: drop the price leaving each one, add the new one
+        if len(history) >= self.short_window:
+            self._short_sum -= history[-self.short_window]
+        if len(history) >= self.long_window:
+            self._long_sum -= history[-self.long_window]
+        self._short_sum += price
+        self._long_sum += price
+        
+        history.append(price)
+        self._tick += 1
     
     def calculate_signals(self) -> Optional[str]:
         """
@@ -71,30 +96,46 @@ class SimpleMovingAverageStrategy:
         Returns:
             str: 'buy', 'sell', or None
         """
-        if len(self.price_history) < self.long_window:
+        # Crossover detection needs the previous long window as well
+        if len(self.price_history) < self.long_window + 1:
             return None
         
+        # A repeated call for the same tick could only repeat the last
+        # signal, which is suppressed as a duplicate anyway
+        tick = self._tick
+        if self._evaluated_tick == tick:
+            return None
+        consecutive = self._evaluated_tick == tick - 1
+        self._evaluated_tick = tick
+        
+        short_window = self.short_window
+        long_window = self.long_window
+        
         # Calculate moving averages
-        short_ma = np.mean(self.price_history[-self.short_window:])
-        long_ma = np.mean(self.price_history[-self.long_window:])
+        short_ma = self._short_sum / short_window
+        long_ma = self._long_sum / long_window
         
-        # Previous moving averages for crossover detection
-        if len(self.price_history) < self.long_window + 1:
-            return None
-            
-        prev_short_ma = np.mean(self.price_history[-(self.short_window + 1):-1])
-        prev_long_ma = np.mean(self.price_history[-(self.long_window + 1):-1])
+        delta = short_ma - long_ma
+        prev_delta = self._prev_delta
+        self._prev_delta = delta
         
         # Detect crossovers
         current_signal = None
         
-        # Bullish crossover: short MA crosses above long MA
-        if prev_short_ma <= prev_long_ma and short_ma > long_ma:
-            current_signal = 'buy'
+        # If the spread kept its sign since the previous tick, no crossover
+        # is possible and the previous moving averages are not needed
+        if not (consecutive and delta * prev_delta > 0):
+            # Previous moving averages for crossover detection
+            prev_short_ma = self._prev_short_sum / short_window
+            prev_long_ma = self._prev_long_sum / long_window
             
-        # Bearish crossover: short MA crosses below long MA  
-        elif prev_short_ma >= prev_long_ma and short_ma < long_ma:
-            current_signal = 'sell'
+            # Bullish crossover: short MA crosses above long MA
+            if prev_short_ma <= prev_long_ma and short_ma > long_ma:
+                current_signal = 'buy'
+                
+            # Bearish crossover: short MA crosses below long MA  
+            elif prev_short_ma >= prev_long_ma and short_ma < long_ma:
+                current_signal = 'sell'
         
         # Avoid duplicate signals
         if current_signal == self.last_signal:
@@ -107,6 +148,109 @@ class SimpleMovingAverageStrategy:
         return current_signal
 
 
+class Position:
+    """Open position record"""
+    
+    __slots__ = ('quantity', 'price', 'timestamp', 'order_id')
+    
+    def __init__(self, quantity: int, price: float, timestamp: float, order_id: str):
+        self.quantity = quantity
+        self.price = price
+        self.timestamp = timestamp
+        self.order_id = order_id
+
+
+class StrategyPool:
+    """
+    Moving Average Crossover Strategy over many symbols
+    
+    Same signals as SimpleMovingAverageStrategy, but every symbol's recent
+    prices live in one 2-D ring buffer so the moving averages of all
+    symbols are computed with a handful of vectorized reductions per tick.
+    """
+    
+    def __init__(
+        self,
+        symbols: List[str],
+        short_window: int = 5,
+        long_window: int = 20
+    ):
+        # numpy is only needed once a pool is created
+        import numpy as np
+        
+        self.symbols = list(symbols)
+        self.short_window = short_window
+        self.long_window = long_window
+        self._symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        
+        # Ring buffer per symbol, large enough for the previous long window.
+        # KRW prices are integers well within float32's exact range, and
+        # crossover decisions do not need more precision than that.
+        n_symbols = len(self.symbols)
+        self.max_history = max(short_window, long_window) + 1
+        self.prices = np.zeros((n_symbols, self.max_history), dtype=np.float32)
+        self.idx = np.zeros(n_symbols, dtype=np.int64)     # Next write slot
+        self.counts = np.zeros(n_symbols, dtype=np.int64)  # Prices received
+        
+        # Last emitted signal per symbol (1: buy, -1: sell, 0: none)
+        self.last_signal = np.zeros(n_symbols, dtype=np.int8)
+        
+        # Slot offsets (back from the write slot) of the current/previous windows
+        self._short_offsets = np.arange(1, short_window + 1)
+        self._long_offsets = np.arange(1, long_window + 1)
+    
+    def symbol_index(self, symbol: str) -> int:
+        """Row of a symbol in the price buffer"""
+        return self._symbol_index[symbol]
+    
+    def add_price(self, symbol_idx: int, price: float):
+        """Add new price for the symbol at symbol_idx"""
+        slot = self.idx[symbol_idx]
+        self.prices[symbol_idx, slot] = price
+        self.idx[symbol_idx] = (slot + 1) % self.max_history
+        self.counts[symbol_idx] += 1
+    
+    def _window_mean(self, offsets: "np.ndarray") -> "np.ndarray":
+        """Mean of each symbol's prices at the given offsets from its write slot"""
+        import numpy as np
+        
+        cols = (self.idx[:, None] - offsets) % self.max_history
+        return np.take_along_axis(self.prices, cols, axis=1).mean(axis=1, dtype=np.float32)
+    
+    def calculate_signals(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Calculate trading signals for all symbols
+        
+        Returns:
+            tuple: Boolean (buy, sell) masks indexed like self.symbols
+        """
+        import numpy as np
+        
+        short_ma = self._window_mean(self._short_offsets)
+        long_ma = self._window_mean(self._long_offsets)
+        prev_short_ma = self._window_mean(self._short_offsets + 1)
+        prev_long_ma = self._window_mean(self._long_offsets + 1)
+        
+        # Crossover detection needs the previous long window as well
+        ready = self.counts > self.long_window
+        buy = ready & (prev_short_ma <= prev_long_ma) & (short_ma > long_ma)
+        sell = ready & (prev_short_ma >= prev_long_ma) & (short_ma < long_ma)
+        signal = buy.astype(np.int8) - sell.astype(np.int8)
+        
+        # Avoid duplicate signals
+        fresh = signal != self.last_signal
+        self.last_signal[ready] = signal[ready]
+        
+        return buy & fresh, sell & fresh
+
+
+class RiskAction(Enum):
+    """Outcome of a risk check on an open position"""
+    NONE = "none"
+    STOP_LOSS = "stop_loss"
+    TAKE_PROFIT = "take_profit"
+
+
 class RiskManager:
     """Risk management system"""
     
@@ -122,12 +266,15 @@ class RiskManager:
         self.take_profit_pct = take_profit_pct
         self.max_daily_loss = max_daily_loss
         
+        # Read once; used on every position size calculation
+        self._min_order_amount = settings.trading.min_order_amount
+        
         # Track daily performance
         self.daily_pnl = 0.0
         self.daily_start_value = None
         
         # Track positions
-        self.positions: Dict[str, Dict] = {}
+        self.positions: Dict[str, Position] = {}
         
     def check_daily_loss_limit(self, current_portfolio_value: float) -> bool:
         """Check if daily loss limit is exceeded"""
@@ -153,50 +300,47 @@ class RiskManager:
         shares = int(max_value / price)
         
         # Ensure minimum order amount
-        min_shares = int(settings.trading.min_order_amount / price)
+        min_shares = int(self._min_order_amount / price)
         
         return max(shares, min_shares) if shares >= min_shares else 0
     
+    @staticmethod
+    def _position_return_pct(position: Position, current_price: float) -> float:
+        """Return of a position, positive when in profit for either side"""
+        side = 1 if position.quantity > 0 else -1  # 1: Long, -1: Short
+        return side * (current_price - position.price) / position.price
+    
+    def evaluate(self, symbol: str, current_price: float) -> RiskAction:
+        """Check stop loss and take profit for a position in one pass"""
+        position = self.positions.get(symbol)
+        if position is None or not position.quantity:
+            return RiskAction.NONE
+        
+        return_pct = self._position_return_pct(position, current_price)
+        if return_pct <= self.stop_loss_pct:
+            return RiskAction.STOP_LOSS
+        if return_pct >= self.take_profit_pct:
+            return RiskAction.TAKE_PROFIT
+        return RiskAction.NONE
+    
     def should_stop_loss(self, symbol: str, current_price: float) -> bool:
         """Check if position should be closed due to stop loss"""
-        if symbol not in self.positions:
-            return False
-            
-        position = self.positions[symbol]
-        entry_price = position['price']
-        quantity = position['quantity']
-        
-        if quantity > 0:  # Long position
-            return_pct = (current_price - entry_price) / entry_price
-            return return_pct <= self.stop_loss_pct
-        elif quantity < 0:  # Short position
-            return_pct = (entry_price - current_price) / entry_price  
-            return return_pct <= self.stop_loss_pct
-            
-        return False
+        return self.evaluate(symbol, current_price) is RiskAction.STOP_LOSS
     
     def should_take_profit(self, symbol: str, current_price: float) -> bool:
         """Check if position should be closed due to take profit"""
-        if symbol not in self.positions:
-            return False
-            
-        position = self.positions[symbol]
-        entry_price = position['price']
-        quantity = position['quantity']
-        
-        if quantity > 0:  # Long position
-            return_pct = (current_price - entry_price) / entry_price
-            return return_pct >= self.take_profit_pct
-        elif quantity < 0:  # Short position (not supported in this example)
-            return_pct = (entry_price - current_price) / entry_price
-            return return_pct >= self.take_profit_pct
-            
-        return False
+        return self.evaluate(symbol, current_price) is RiskAction.TAKE_PROFIT
 
 
 class AlgorithmicTrader:
     """Main algorithmic trading system"""
     
+    # Seconds between portfolio value refreshes
+    BALANCE_REFRESH_INTERVAL = 600
+    
+    # Pending order operations before new ones are dropped
+    ORDER_QUEUE_SIZE = 16
+    
     def __init__(self):
         # Initialize components
         self.client = KISClient(
@@ -219,6 +363,14 @@ class AlgorithmicTrader:
         self.is_running = False
         self.portfolio_value = 0.0
         
+        # Set to end run_strategy; timers replace polling while running
+        self._stop_event = asyncio.Event()
+        self._balance_timer: Optional[asyncio.TimerHandle] = None
+        
+        # Order operations from price callbacks, executed one at a time
+        self._orders: "asyncio.Queue[Tuple[Any, ...]]" = asyncio.Queue(maxsize=self.ORDER_QUEUE_SIZE)
+        self._order_task: Optional[asyncio.Task] = None
+        
     async def initialize(self) -> bool:
         """Initialize trading system"""
         logger.info("Initializing algorithmic trading system...")
@@ -242,6 +394,9 @@ class AlgorithmicTrader:
             logger.error("WebSocket connection failed")
             return False
         
+        # Start order consumer before price updates can enqueue orders
+        self._order_task = asyncio.create_task(self._order_consumer())
+        
         # Subscribe to price updates
         await self.ws_client.subscribe_price(
             [self.strategy.symbol],
@@ -251,32 +406,54 @@ class AlgorithmicTrader:
         logger.info("✅ Trading system initialized successfully")
         return True
     
-    def on_price_update(self, data: Dict):
+    def on_price_update(self, data: "PriceTick"):
         """Handle real-time price updates"""
-        if data['symbol'] != self.strategy.symbol:
+        strategy = self.strategy
+        symbol = strategy.symbol
+        if data.symbol != symbol:
             return
             
-        current_price = float(data['price'])
-        logger.info(f"Price update: {self.strategy.symbol} = {current_price:,.0f} KRW")
+        current_price = float(data.price)
+        logger.info(f"Price update: {symbol} = {current_price:,.0f} KRW")
         
         # Add price to strategy
-        self.strategy.add_price(current_price)
+        strategy.add_price(current_price)
         
         # Check risk management conditions
-        if self.risk_manager.should_stop_loss(self.strategy.symbol, current_price):
+        action = self.risk_manager.evaluate(symbol, current_price)
+        if action is RiskAction.STOP_LOSS:
             logger.warning("Stop loss triggered!")
-            asyncio.create_task(self.close_position("stop_loss"))
+            self._enqueue_order(("close", action.value))
             return
             
-        if self.risk_manager.should_take_profit(self.strategy.symbol, current_price):
+        if action is RiskAction.TAKE_PROFIT:
             logger.info("Take profit triggered!")
-            asyncio.create_task(self.close_position("take_profit"))
+            self._enqueue_order(("close", action.value))
             return
         
         # Check for trading signals
-        signal = self.strategy.calculate_signals()
+        signal = strategy.calculate_signals()
         if signal:
-            asyncio.create_task(self.execute_signal(signal, current_price))
+            self._enqueue_order(("signal", signal, current_price))
+    
+    def _enqueue_order(self, op: Tuple[Any, ...]):
+        """Queue an order operation for the order consumer"""
+        try:
+            self._orders.put_nowait(op)
+        except asyncio.QueueFull:
+            logger.warning(f"Order queue full, dropping {op[0]} request")
+    
+    async def _order_consumer(self):
+        """Execute queued order operations sequentially"""
+        while True:
+            op = await self._orders.get()
+            try:
+                if op[0] == "close":
+                    await self.close_position(op[1])
+                else:
+                    await self.execute_signal(op[1], op[2])
+            finally:
+                self._orders.task_done()
     
     async def execute_signal(self, signal: str, current_price: float):
         """Execute trading signal"""
@@ -293,14 +470,18 @@ class AlgorithmicTrader:
     
     async def execute_buy(self, price: float):
         """Execute buy order"""
+        risk_manager = self.risk_manager
+        symbol = self.strategy.symbol
+        portfolio_value = self.portfolio_value
+        
         # Check daily loss limit
-        if self.risk_manager.check_daily_loss_limit(self.portfolio_value):
+        if risk_manager.check_daily_loss_limit(portfolio_value):
             logger.warning("Daily loss limit reached, skipping buy signal")
             return
         
         # Calculate position size
-        position_size = self.risk_manager.calculate_position_size(
-            self.portfolio_value, price
+        position_size = risk_manager.calculate_position_size(
+            portfolio_value, price
         )
         
         if position_size <= 0:
@@ -310,18 +491,18 @@ class AlgorithmicTrader:
         try:
             # Place market buy order
             result = self.client.buy_stock(
-                symbol=self.strategy.symbol,
+                symbol=symbol,
                 quantity=position_size,
                 order_type="01"  # Market order
             )
             
             # Update position tracking
-            self.risk_manager.positions[self.strategy.symbol] = {
-                'quantity': position_size,
-                'price': price,
-                'timestamp': datetime.now(),
-                'order_id': result['output']['ODNO']
-            }
+            risk_manager.positions[symbol] = Position(
+                quantity=position_size,
+                price=price,
+                timestamp=time.time(),
+                order_id=result['output']['ODNO']
+            )
             
             self.strategy.position = 1
             
@@ -332,28 +513,30 @@ class AlgorithmicTrader:
     
     async def execute_sell(self, price: float):
         """Execute sell order"""
-        if self.strategy.symbol not in self.risk_manager.positions:
+        positions = self.risk_manager.positions
+        symbol = self.strategy.symbol
+        position = positions.get(symbol)
+        if position is None:
             logger.warning("No position to sell")
             return
         
-        position = self.risk_manager.positions[self.strategy.symbol]
-        quantity = position['quantity']
+        quantity = position.quantity
         
         try:
             # Place market sell order
             result = self.client.sell_stock(
-                symbol=self.strategy.symbol,
+                symbol=symbol,
                 quantity=quantity,
                 order_type="01"  # Market order
             )
             
             # Calculate P&L
-            entry_price = position['price']
+            entry_price = position.price
             pnl = (price - entry_price) * quantity
             pnl_pct = (price - entry_price) / entry_price * 100
             
             # Remove position
-            del self.risk_manager.positions[self.strategy.symbol]
+            del positions[symbol]
             self.strategy.position = 0
             
             logger.info(f"✅ Sell order placed: {quantity} shares at ~{price:,.0f} KRW")
@@ -378,30 +561,40 @@ class AlgorithmicTrader:
         except Exception as e:
             logger.error(f"Failed to close position: {e}")
     
+    def _refresh_balance(self):
+        """Refresh portfolio value and schedule the next refresh"""
+        self._balance_timer = asyncio.get_running_loop().call_later(
+            self.BALANCE_REFRESH_INTERVAL, self._refresh_balance
+        )
+        
+        try:
+            balance = self.client.get_balance()
+            self.portfolio_value = float(balance['output2'][0]['tot_evlu_amt'])
+            logger.info(f"Portfolio value: {self.portfolio_value:,.0f} KRW")
+        except Exception as e:
+            logger.warning(f"Failed to refresh portfolio value: {e}")
+    
     async def run_strategy(self, duration_minutes: int = 60):
         """Run the algorithmic trading strategy"""
         logger.info(f"Starting algorithmic trading for {duration_minutes} minutes...")
         
         self.is_running = True
-        start_time = datetime.now()
-        end_time = start_time + timedelta(minutes=duration_minutes)
+        self._stop_event.clear()
+        
+        # Trading itself is driven by price callbacks; only timers run here
+        loop = asyncio.get_running_loop()
+        stop_timer = loop.call_later(duration_minutes * 60, self._stop_event.set)
+        self._balance_timer = loop.call_later(
+            self.BALANCE_REFRESH_INTERVAL, self._refresh_balance
+        )
         
         try:
-            while self.is_running and datetime.now() < end_time:
-                # Update portfolio value periodically
-                if datetime.now().minute % 10 == 0:  # Every 10 minutes
-                    try:
-                        balance = self.client.get_balance()
-                        self.portfolio_value = float(balance['output2'][0]['tot_evlu_amt'])
-                        logger.info(f"Portfolio value: {self.portfolio_value:,.0f} KRW")
-                    except:
-                        pass
-                
-                await asyncio.sleep(1)  # Small delay
+            await self._stop_event.wait()
                 
         except KeyboardInterrupt:
             logger.info("Received interrupt signal")
         finally:
+            stop_timer.cancel()
             await self.cleanup()
     
     async def cleanup(self):
@@ -409,6 +602,15 @@ class AlgorithmicTrader:
         logger.info("Cleaning up trading system...")
         
         self.is_running = False
+        self._stop_event.set()
+        if self._balance_timer is not None:
+            self._balance_timer.cancel()
+            self._balance_timer = None
+        
+        # Stop executing queued orders before the final close
+        if self._order_task is not None:
+            self._order_task.cancel()
+            self._order_task = None
         
         # Close any open positions
         if self.strategy.symbol in self.risk_manager.positions:
@@ -417,6 +619,9 @@ class AlgorithmicTrader:
         # Disconnect WebSocket
         await self.ws_client.disconnect()
         
+        # Release HTTP connections
+        await self.client.aclose()
+        
         logger.info("✅ Cleanup completed")
 
 
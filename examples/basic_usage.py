@@ -52,29 +52,28 @@ def example_account_info():
     print("\n=== Account Information Example ===")
     
     # Initialize client
-    client = KISClient(
+    with KISClient(
         app_key=settings.api.app_key,
         app_secret=settings.api.app_secret,
         account_number=settings.api.account_number,
         is_mock=True
-    )
-    
-    # Authenticate
-    if not client.authenticate():
-        print("❌ Authentication failed")
-        return
-    
-    try:
-        # Get account balance
-        balance = client.get_balance()
-        
-        print("✅ Account balance retrieved:")
-        print(f"Total evaluation amount: {balance['output2'][0]['tot_evlu_amt']} KRW")
-        print(f"Available cash: {balance['output2'][0]['dnca_tot_amt']} KRW")
-        print(f"Total profit/loss: {balance['output2'][0]['evlu_pfls_smtl_amt']} KRW")
+    ) as client:
+        # Authenticate
+        if not client.authenticate():
+            print("❌ Authentication failed")
+            return
         
-    except Exception as e:
-        print(f"❌ Failed to get balance: {e}")
+        try:
+            # Get account balance
+            balance = client.get_balance()
+            
+            print("✅ Account balance retrieved:")
+            print(f"Total evaluation amount: {balance['output2'][0]['tot_evlu_amt']} KRW")
+            print(f"Available cash: {balance['output2'][0]['dnca_tot_amt']} KRW")
+            print(f"Total profit/loss: {balance['output2'][0]['evlu_pfls_smtl_amt']} KRW")
+            
+        except Exception as e:
+            print(f"❌ Failed to get balance: {e}")
 
 
 def example_market_data():
@@ -82,30 +81,29 @@ def example_market_data():
     print("\n=== Market Data Example ===")
     
     # Initialize client
-    client = KISClient(
+    with KISClient(
         app_key=settings.api.app_key,
         app_secret=settings.api.app_secret,
         is_mock=True
-    )
-    
-    # Authenticate
-    if not client.authenticate():
-        print("❌ Authentication failed")
-        return
-    
-    try:
-        # Get current price for Samsung Electronics (005930)
-        symbol = "005930"  # Samsung Electronics
-        price_data = client.get_current_price(symbol)
-        
-        print(f"✅ Current price for {symbol}:")
-        output = price_data['output']
-        print(f"Current price: {output['stck_prpr']} KRW")
-        print(f"Change: {output['prdy_vrss']} KRW ({output['prdy_vrss_rate']}%)")
-        print(f"Volume: {output['acml_vol']} shares")
+    ) as client:
+        # Authenticate
+        if not client.authenticate():
+            print("❌ Authentication failed")
+            return
         
-    except Exception as e:
-        print(f"❌ Failed to get market data: {e}")
+        try:
+            # Get current price for Samsung Electronics (005930)
+            symbol = "005930"  # Samsung Electronics
+            price_data = client.get_current_price(symbol)
+            
+            print(f"✅ Current price for {symbol}:")
+            output = price_data['output']
+            print(f"Current price: {output['stck_prpr']} KRW")
+            print(f"Change: {output['prdy_vrss']} KRW ({output['prdy_vrss_rate']}%)")
+            print(f"Volume: {output['acml_vol']} shares")
+            
+        except Exception as e:
+            print(f"❌ Failed to get market data: {e}")
 
 
 def example_simple_trading():
@@ -113,39 +111,38 @@ def example_simple_trading():
     print("\n=== Simple Trading Example ===")
     
     # Initialize client
-    client = KISClient(
+    with KISClient(
         app_key=settings.api.app_key,
         app_secret=settings.api.app_secret,
         account_number=settings.api.account_number,
         is_mock=True
-    )
-    
-    # Authenticate
-    if not client.authenticate():
-        print("❌ Authentication failed")
-        return
-    
-    symbol = "005930"  # Samsung Electronics
-    quantity = 1       # 1 share
-    
-    try:
-        # Market buy order
-        print(f"Placing market buy order for {quantity} shares of {symbol}")
-        buy_result = client.buy_stock(
-            symbol=symbol,
-            quantity=quantity,
-            order_type="01"  # Market order
-        )
-        
-        print("✅ Buy order placed:")
-        print(f"Order number: {buy_result['output']['ODNO']}")
-        print(f"Order time: {buy_result['output']['ORD_TMD']}")
+    ) as client:
+        # Authenticate
+        if not client.authenticate():
+            print("❌ Authentication failed")
+            return
         
-        # Note: In a real scenario, you'd wait for execution before selling
-        # This is just for demonstration
+        symbol = "005930"  # Samsung Electronics
+        quantity = 1       # 1 share
         
-    except Exception as e:
-        print(f"❌ Trading failed: {e}")
+        try:
+            # Market buy order
+            print(f"Placing market buy order for {quantity} shares of {symbol}")
+            buy_result = client.buy_stock(
+                symbol=symbol,
+                quantity=quantity,
+                order_type="01"  # Market order
+            )
+            
+            print("✅ Buy order placed:")
+            print(f"Order number: {buy_result['output']['ODNO']}")
+            print(f"Order time: {buy_result['output']['ORD_TMD']}")
+            
+            # Note: In a real scenario, you'd wait for execution before selling
+            # This is just for demonstration
+            
+        except Exception as e:
+            print(f"❌ Trading failed: {e}")
 
 
 async def example_websocket_data():
@@ -161,14 +158,14 @@ async def example_websocket_data():
     
     # Price update callback
     def on_price_update(data):
-        print(f"📈 Price update: {data['symbol']} = {data['price']} KRW "
-              f"({data['change']:+} / {data['change_rate']:+.2f}%)")
+        print(f"📈 Price update: {data.symbol} = {data.price} KRW "
+              f"({data.change:+} / {data.change_rate:+.2f}%)")
     
     # Orderbook update callback  
     def on_orderbook_update(data):
-        print(f"📊 Orderbook update: {data['symbol']} "
-              f"Best Bid: {data['buy_prices'][0]} "
-              f"Best Ask: {data['sell_prices'][0]}")
+        print(f"📊 Orderbook update: {data.symbol} "
+              f"Best Bid: {data.buy_prices[0]} "
+              f"Best Ask: {data.sell_prices[0]}")
     
     try:
         # Connect to WebSocket
@@ -203,34 +200,33 @@ def example_order_management():
     print("\n=== Order Management Example ===")
     
     # Initialize client
-    client = KISClient(
+    with KISClient(
         app_key=settings.api.app_key,
         app_secret=settings.api.app_secret,
         account_number=settings.api.account_number,
         is_mock=True
-    )
-    
-    # Authenticate
-    if not client.authenticate():
-        print("❌ Authentication failed")
-        return
-    
-    try:
-        # Get recent order history (last 30 days)
-        end_date = datetime.now().strftime("%Y%m%d")
-        start_date = (datetime.now() - timedelta(days=30)).strftime("%Y%m%d")
-        
-        order_history = client.get_order_history(start_date, end_date)
+    ) as client:
+        # Authenticate
+        if not client.authenticate():
+            print("❌ Authentication failed")
+            return
         
-        orders = order_history.get('output1', [])
-        print(f"✅ Retrieved {len(orders)} recent orders:")
+        try:
+            # Get recent order history (last 30 days)
+            end_date = datetime.now().strftime("%Y%m%d")
+            start_date = (datetime.now() - timedelta(days=30)).strftime("%Y%m%d")
+            
+            order_history = client.get_order_history(start_date, end_date)
+            
+            orders = order_history.get('output1', [])
+            print(f"✅ Retrieved {len(orders)} recent orders:")
+            
+            for i, order in enumerate(orders[:5]):  # Show first 5 orders
+                print(f"  {i+1}. {order['pdno']} | {order['ord_qty']} shares | "
+                      f"{order['ord_unpr']} KRW | Status: {order['ord_dvsn_name']}")
         
-        for i, order in enumerate(orders[:5]):  # Show first 5 orders
-            print(f"  {i+1}. {order['pdno']} | {order['ord_qty']} shares | "
-                  f"{order['ord_unpr']} KRW | Status: {order['ord_dvsn_name']}")
-    
-    except Exception as e:
-        print(f"❌ Failed to get order history: {e}")
+        except Exception as e:
+            print(f"❌ Failed to get order history: {e}")
 
 
 def main():
@@ -58,6 +58,10 @@ setup(
             "matplotlib>=3.8.0",
             "plotly>=5.17.0",
             "seaborn>=0.13.0",
+        ],
+        "fast": [
+            "orjson>=3.9.0",
+            "uvloop>=0.19.0; sys_platform != 'win32'",
         ]
     },
     entry_points={
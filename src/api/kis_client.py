@@ -6,18 +6,110 @@ Main client for interacting with KIS OpenAPI REST endpoints.
 Provides methods for trading, account management, and market data.
 """
 
+import asyncio
 import requests
-import json
 import logging
-from typing import Dict, List, Optional, Any, Union
+import time
+import weakref
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Any, Mapping, Tuple, Union
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 import hashlib
 
 from ..auth.kis_auth import KISAuth
 from ..utils.exceptions import KISAPIError, KISAuthError
+from ..utils import fastjson
+from ..utils.http import create_session, create_async_session
+
+if TYPE_CHECKING:
+    import aiohttp
+    from ..websocket.kis_parsers import PriceTick
+    from ..websocket.kis_websocket import KISWebSocket
 
 logger = logging.getLogger(__name__)
 
+# REST endpoint paths, joined with the environment's base URL once per client
+_ENDPOINT_PATHS = MappingProxyType({
+    "balance": "/uapi/domestic-stock/v1/trading/inquire-balance",
+    "order_cash": "/uapi/domestic-stock/v1/trading/order-cash",
+    "order_revise_cancel": "/uapi/domestic-stock/v1/trading/order-rvsecncl",
+    "order_history": "/uapi/domestic-stock/v1/trading/inquire-daily-ccld",
+    "price": "/uapi/domestic-stock/v1/quotations/inquire-price",
+})
+
+# Transaction IDs per operation
+_TR_IDS = MappingProxyType({
+    "balance": "TTTC8434R",
+    "buy": "TTTC0802U",
+    "sell": "TTTC0801U",
+    "cancel": "TTTC0803U",
+    "order_history": "TTTC8001R",
+    "price": "FHKST01010100",
+})
+
+# Static request fields; per-call values (account, symbol, ...) are merged in
+_BALANCE_PARAMS = MappingProxyType({
+    "AFHR_FLPR_YN": "N",  # After hours flag
+    "OFL_YN": "",         # Offline flag  
+    "INQR_DVSN": "02",    # Inquiry division
+    "UNPR_DVSN": "01",    # Unit price division
+    "FUND_STTL_ICLD_YN": "N",  # Fund settlement included
+    "FNCG_AMT_AUTO_RDPT_YN": "N",  # Financing amount auto redemption
+    "PRCS_DVSN": "01",    # Process division
+    "CTX_AREA_FK100": "",
+    "CTX_AREA_NK100": ""
+})
+
+# Decimal strings for small ints; KIS expects order quantities/prices as strings
+_INT_STR_CACHE = {i: str(i) for i in range(10001)}
+
+
+def _int_str(value: int) -> str:
+    """Return str(value), reusing cached strings for 0..10000"""
+    cached = _INT_STR_CACHE.get(value)
+    return cached if cached is not None else str(value)
+
+
+# Holdings (output1) fields returned as strings that hold numbers
+BALANCE_NUMERIC_COLS = (
+    "hldg_qty",             # Holding quantity
+    "ord_psbl_qty",         # Orderable quantity
+    "pchs_avg_pric",        # Average purchase price
+    "pchs_amt",             # Purchase amount
+    "prpr",                 # Current price
+    "evlu_amt",             # Evaluation amount
+    "evlu_pfls_amt",        # Evaluation profit/loss
+    "evlu_pfls_rt",         # Evaluation profit/loss rate
+    "evlu_erng_rt",         # Evaluation earning rate
+    "bfdy_cprs_icdc",       # Change vs previous day
+    "fltt_rt",              # Fluctuation rate
+    "thdt_buyqty",          # Bought today
+    "thdt_sll_qty",         # Sold today
+)
+
+_ORDER_HISTORY_PARAMS = MappingProxyType({
+    "SLL_BUY_DVSN_CD": "00",  # All orders
+    "INQR_DVSN": "00",
+    "PDNO": "",
+    "CCLD_DVSN": "00",
+    "ORD_GNO_BRNO": "",
+    "ODNO": "",
+    "INQR_DVSN_3": "00",
+    "INQR_DVSN_1": "",
+    "CTX_AREA_FK100": "",
+    "CTX_AREA_NK100": ""
+})
+
+_CANCEL_ORDER_DATA = MappingProxyType({
+    "KRX_FWDG_ORD_ORGNO": "",
+    "ORD_DVSN": "00",
+    "RVSE_CNCL_DVSN_CD": "02",  # Cancel
+    "ORD_QTY": "0",
+    "ORD_UNPR": "0",
+    "QTY_ALL_ORD_YN": "Y"  # Cancel all quantity
+})
+
 
 class KISClient:
     """
@@ -26,6 +118,17 @@ class KISClient:
     Provides comprehensive access to KIS trading and market data APIs.
     """
     
+    __slots__ = (
+        "session", "_session_finalizer", "auth", "_account_number", "_cano",
+        "_acnt_prdt_cd", "_buy_ctx", "_sell_ctx", "timeout", "_auth_headers",
+        "_base_headers", "_async_session", "base_url", "_urls",
+        "_price_cache", "_price_cache_ttl",
+        "__weakref__"  # Session finalizer holds a weak reference
+    )
+    
+    # Gateway codes returned for expired or otherwise invalid access tokens
+    TOKEN_REJECTED_CODES = frozenset({"EGW00121", "EGW00123"})
+    
     def __init__(
         self,
         app_key: str,
@@ -44,44 +147,153 @@ class KISClient:
             is_mock: Use mock environment (default: True)
             timeout: Request timeout in seconds (default: 30)
         """
-        self.auth = KISAuth(app_key, app_secret, is_mock)
+        # Session for connection pooling, shared with authentication so
+        # token requests and API calls reuse the same connections
+        self.session = create_session()
+        self._session_finalizer = weakref.finalize(self, self.session.close)
+        self.auth = KISAuth(app_key, app_secret, is_mock, session=self.session)
         self.account_number = account_number
         self.timeout = timeout
         
-        # Session for connection pooling
-        self.session = requests.Session()
+        # Auth + common headers per customer type, rebuilt when the token changes
+        self._auth_headers: Optional[Mapping[str, str]] = None
+        self._base_headers: Dict[str, Mapping[str, str]] = {}
+        
+        # Quotes by symbol as (monotonic time, response); only consulted
+        # once a WebSocket feed is attached (see attach_websocket)
+        self._price_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._price_cache_ttl: Optional[float] = None
+        
+        # Async session for the *_async methods, created on first use
+        self._async_session: Optional["aiohttp.ClientSession"] = None
         
         # API endpoints
         self.base_url = self.auth.base_url
+        self._urls = {name: self.base_url + path for name, path in _ENDPOINT_PATHS.items()}
+        
+    @property
+    def account_number(self) -> str:
+        """Trading account number (8-digit CANO + product code)"""
+        return self._account_number
+    
+    @account_number.setter
+    def account_number(self, value: str):
+        self._account_number = value
+        self._cano = value[:8]
+        self._acnt_prdt_cd = value[8:]
         
-    def authenticate(self) -> bool:
+        # Per-side order contexts for the default account
+        account_fields = {"CANO": self._cano, "ACNT_PRDT_CD": self._acnt_prdt_cd} if value else None
+        self._buy_ctx = self._order_context("buy", account_fields)
+        self._sell_ctx = self._order_context("sell", account_fields)
+    
+    @staticmethod
+    def _order_context(side: str, account_fields: Optional[Dict[str, str]]) -> tuple:
+        """
+        Build the (endpoint_key, tr_id, body template) triple for an order side
+        
+        The template is None when no account is available.
+        """
+        tr_id = _TR_IDS["buy"] if side == "buy" else _TR_IDS["sell"]
+        template = None
+        if account_fields is not None:
+            template = {**account_fields, "PDNO": "", "ORD_DVSN": "", "ORD_QTY": "", "ORD_UNPR": ""}
+        return ("order_cash", tr_id, template)
+    
+    def _account_fields(self, account_number: Optional[str]) -> Dict[str, str]:
+        """Return the CANO/ACNT_PRDT_CD request fields for an account"""
+        if account_number:
+            return {"CANO": account_number[:8], "ACNT_PRDT_CD": account_number[8:]}
+        if not self._account_number:
+            raise ValueError("Account number is required")
+        return {"CANO": self._cano, "ACNT_PRDT_CD": self._acnt_prdt_cd}
+    
+    def authenticate(self, force: bool = False) -> bool:
         """
         Authenticate with KIS API
         
+        Same as KISAuth.authenticate: a still-valid token (e.g. one loaded
+        from the token cache) is reused unless force is set.
+        
+        Args:
+            force: Request a new token even if the current one is valid
+                (default: False)
+        
         Returns:
             bool: True if successful
         """
-        return self.auth.authenticate()
+        return self.auth.authenticate(force=force)
+    
+    def _build_headers(self, tr_id: str, custtype: str) -> Mapping[str, str]:
+        """Build authenticated request headers"""
+        # Ensure we have valid authentication
+        auth_headers = self.auth.get_auth_headers()
+        if auth_headers is not self._auth_headers:
+            self._auth_headers = auth_headers
+            self._base_headers = {}
+        
+        # Add common headers
+        headers = self._base_headers.get(custtype)
+        if headers is None:
+            headers = self._base_headers[custtype] = MappingProxyType({
+                **auth_headers,
+                "Content-Type": "application/json; charset=utf-8",
+                "custtype": custtype
+            })
+        
+        # Add transaction ID if provided
+        if tr_id:
+            return {**headers, "tr_id": tr_id}
+        
+        return headers
+    
+    def _check_response(self, status_code: int, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate a decoded API response
+        
+        Raises:
+            KISAPIError: On HTTP or API-level errors
+        """
+        # Handle HTTP errors
+        if status_code != 200:
+            error_msg = result.get('msg1', f'HTTP {status_code}')
+            logger.error("API request failed: %s", error_msg)
+            raise KISAPIError(error_msg, status_code, result)
+        
+        # Check for API-level errors
+        if result.get('rt_cd') != '0':
+            error_msg = result.get('msg1', 'Unknown API error')
+            logger.error("API returned error: %s", error_msg)
+            raise KISAPIError(error_msg, status_code, result)
+        
+        return result
+    
+    def _is_token_rejected(self, status_code: int, result: Dict[str, Any]) -> bool:
+        """Check whether a response rejects the access token that was sent"""
+        return status_code == 401 or result.get('msg_cd') in self.TOKEN_REJECTED_CODES
     
     def _make_request(
         self,
         method: str,
-        endpoint: str,
+        endpoint_key: str,
         data: Optional[Dict] = None,
         params: Optional[Dict] = None,
         tr_id: str = "",
-        custtype: str = "P"  # P: Personal, B: Business
+        custtype: str = "P",  # P: Personal, B: Business
+        _retry_auth: bool = True
     ) -> Dict[str, Any]:
         """
         Make authenticated request to KIS API
         
         Args:
             method: HTTP method (GET, POST, PUT, DELETE)
-            endpoint: API endpoint path
+            endpoint_key: Endpoint name in _ENDPOINT_PATHS
             data: Request body data
             params: Query parameters
             tr_id: Transaction ID for the request
             custtype: Customer type (P: Personal, B: Business)
+            _retry_auth: Re-authenticate and retry once if the token
+                is rejected (e.g. a cached token revoked server-side)
             
         Returns:
             dict: API response data
@@ -91,58 +303,125 @@ class KISClient:
             KISAPIError: If API request fails
         """
         try:
-            # Ensure we have valid authentication
-            headers = self.auth.get_auth_headers()
+            headers = self._build_headers(tr_id, custtype)
+            token = self.auth.access_token
+            url = self._urls[endpoint_key]
             
-            # Add common headers
-            headers.update({
-                "Content-Type": "application/json; charset=utf-8",
-                "custtype": custtype
-            })
-            
-            # Add transaction ID if provided
-            if tr_id:
-                headers["tr_id"] = tr_id
-            
-            url = f"{self.base_url}{endpoint}"
-            
-            logger.debug(f"Making {method} request to {url}")
+            logger.debug("Making %s request to %s", method, url)
             
             # Make request
             response = self.session.request(
                 method=method,
                 url=url,
                 headers=headers,
-                json=data if data else None,
+                data=fastjson.dumps(data) if data else None,
                 params=params,
                 timeout=self.timeout
             )
             
-            # Handle HTTP errors
-            if response.status_code != 200:
-                error_data = response.json() if response.content else {}
-                error_msg = error_data.get('msg1', f'HTTP {response.status_code}')
-                logger.error(f"API request failed: {error_msg}")
-                raise KISAPIError(error_msg, response.status_code, error_data)
+            result = fastjson.loads(response.content) if response.content else {}
+            if _retry_auth and self._is_token_rejected(response.status_code, result):
+                logger.warning("Access token rejected; re-authenticating")
+                self.auth.invalidate_token(token)
+                return self._make_request(
+                    method, endpoint_key, data, params, tr_id, custtype, _retry_auth=False
+                )
+            return self._check_response(response.status_code, result)
+            
+        except requests.RequestException as e:
+            logger.error("Request failed: %s", e)
+            raise KISAPIError(f"Request failed: {e}")
+        except ValueError as e:
+            if "authentication" in str(e).lower():
+                raise KISAuthError(str(e))
+            raise KISAPIError(f"Response parsing failed: {e}")
+    
+    async def _ensure_session(self) -> "aiohttp.ClientSession":
+        """Return the shared async session, creating it if needed"""
+        if self._async_session is None or self._async_session.closed:
+            self._async_session = create_async_session(self.timeout)
+        return self._async_session
+    
+    async def _make_request_async(
+        self,
+        method: str,
+        endpoint_key: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        tr_id: str = "",
+        custtype: str = "P",  # P: Personal, B: Business
+        _retry_auth: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Make authenticated request to KIS API without blocking the event loop
+        
+        Same arguments, return value and errors as _make_request.
+        """
+        import aiohttp  # Already loaded by the async session
+        
+        try:
+            headers = self._build_headers(tr_id, custtype)
+            token = self.auth.access_token
+            url = self._urls[endpoint_key]
             
-            result = response.json()
+            logger.debug("Making async %s request to %s", method, url)
             
-            # Check for API-level errors
-            if result.get('rt_cd') != '0':
-                error_msg = result.get('msg1', 'Unknown API error')
-                logger.error(f"API returned error: {error_msg}")
-                raise KISAPIError(error_msg, response.status_code, result)
+            session = await self._ensure_session()
+            async with session.request(
+                method,
+                url,
+                headers=headers,
+                data=fastjson.dumps(data) if data else None,
+                params=params
+            ) as response:
+                status_code = response.status
+                content = await response.read()
             
-            return result
+            result = fastjson.loads(content) if content else {}
+            if _retry_auth and self._is_token_rejected(status_code, result):
+                logger.warning("Access token rejected; re-authenticating")
+                self.auth.invalidate_token(token)
+                return await self._make_request_async(
+                    method, endpoint_key, data, params, tr_id, custtype, _retry_auth=False
+                )
+            return self._check_response(status_code, result)
             
-        except requests.RequestException as e:
-            logger.error(f"Request failed: {e}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error("Request failed: %s", e)
             raise KISAPIError(f"Request failed: {e}")
         except ValueError as e:
             if "authentication" in str(e).lower():
                 raise KISAuthError(str(e))
             raise KISAPIError(f"Response parsing failed: {e}")
     
+    def close(self):
+        """
+        Close the HTTP session and stop background token refresh
+        
+        Use aclose() instead if the *_async methods were used.
+        """
+        self.auth.close()
+        self._session_finalizer()
+    
+    async def aclose(self):
+        """Close the async and sync HTTP sessions"""
+        if self._async_session is not None:
+            await self._async_session.close()
+            self._async_session = None
+        self.close()
+    
+    def __enter__(self) -> "KISClient":
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    async def __aenter__(self) -> "KISClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+    
     def get_balance(self, account_number: Optional[str] = None) -> Dict[str, Any]:
         """
         Get account balance and holdings
@@ -153,30 +432,52 @@ class KISClient:
         Returns:
             dict: Account balance information
         """
-        acct_no = account_number or self.account_number
-        if not acct_no:
-            raise ValueError("Account number is required")
+        return self._make_request(**self._balance_request(account_number))
+    
+    async def get_balance_async(self, account_number: Optional[str] = None) -> Dict[str, Any]:
+        """Async version of get_balance"""
+        return await self._make_request_async(**self._balance_request(account_number))
+    
+    def get_balance_df(self, account_number: Optional[str] = None):
+        """
+        Get account holdings as a pandas DataFrame
         
-        params = {
-            "CANO": acct_no[:8],
-            "ACNT_PRDT_CD": acct_no[8:],
-            "AFHR_FLPR_YN": "N",  # After hours flag
-            "OFL_YN": "",         # Offline flag  
-            "INQR_DVSN": "02",    # Inquiry division
-            "UNPR_DVSN": "01",    # Unit price division
-            "FUND_STTL_ICLD_YN": "N",  # Fund settlement included
-            "FNCG_AMT_AUTO_RDPT_YN": "N",  # Financing amount auto redemption
-            "PRCS_DVSN": "01",    # Process division
-            "CTX_AREA_FK100": "",
-            "CTX_AREA_NK100": ""
-        }
+        Numeric fields (BALANCE_NUMERIC_COLS) are converted from the API's
+        string encoding in a single vectorized pass per column.
         
-        return self._make_request(
-            "GET",
-            "/uapi/domestic-stock/v1/trading/inquire-balance",
-            params=params,
-            tr_id="TTTC8434R"
-        )
+        Args:
+            account_number: Account number (uses default if not provided)
+            
+        Returns:
+            pandas.DataFrame: One row per holding (output1)
+        """
+        return self._holdings_frame(self.get_balance(account_number))
+    
+    async def get_balance_df_async(self, account_number: Optional[str] = None):
+        """Async version of get_balance_df"""
+        return self._holdings_frame(await self.get_balance_async(account_number))
+    
+    @staticmethod
+    def _holdings_frame(result: Dict[str, Any]):
+        """Convert a get_balance response's holdings into a typed DataFrame"""
+        import pandas as pd
+        
+        df = pd.DataFrame.from_records(result.get("output1") or [])
+        numeric = [col for col in BALANCE_NUMERIC_COLS if col in df.columns]
+        if numeric:
+            df[numeric] = df[numeric].apply(pd.to_numeric, errors="coerce")
+        return df
+    
+    def _balance_request(self, account_number: Optional[str]) -> Dict[str, Any]:
+        """Build the request arguments for get_balance"""
+        params = {**self._account_fields(account_number), **_BALANCE_PARAMS}
+        
+        return {
+            "method": "GET",
+            "endpoint_key": "balance",
+            "params": params,
+            "tr_id": _TR_IDS["balance"]
+        }
     
     def buy_stock(
         self,
@@ -199,14 +500,9 @@ class KISClient:
         Returns:
             dict: Order result
         """
-        return self._place_order(
-            symbol=symbol,
-            quantity=quantity,
-            price=price,
-            order_type=order_type,
-            side="buy",
-            account_number=account_number
-        )
+        if account_number:
+            return self._place_order(symbol, quantity, price, order_type, "buy", account_number)
+        return self._send_order(self._buy_ctx, symbol, quantity, price, order_type)
     
     def sell_stock(
         self,
@@ -229,14 +525,9 @@ class KISClient:
         Returns:
             dict: Order result
         """
-        return self._place_order(
-            symbol=symbol,
-            quantity=quantity,
-            price=price,
-            order_type=order_type,
-            side="sell",
-            account_number=account_number
-        )
+        if account_number:
+            return self._place_order(symbol, quantity, price, order_type, "sell", account_number)
+        return self._send_order(self._sell_ctx, symbol, quantity, price, order_type)
     
     def _place_order(
         self,
@@ -248,35 +539,39 @@ class KISClient:
         account_number: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        Internal method to place buy/sell orders
+        Internal method to place buy/sell orders for any account
+        """
+        ctx = self._order_context(side, self._account_fields(account_number))
+        return self._send_order(ctx, symbol, quantity, price, order_type)
+    
+    def _send_order(
+        self,
+        ctx: tuple,
+        symbol: str,
+        quantity: int,
+        price: Optional[int],
+        order_type: str
+    ) -> Dict[str, Any]:
+        """
+        Fill an order context's body template and submit it
         """
-        acct_no = account_number or self.account_number
-        if not acct_no:
+        endpoint_key, tr_id, template = ctx
+        if template is None:
             raise ValueError("Account number is required")
         
         # Validate order type and price
         if order_type == "00" and price is None:
             raise ValueError("Price is required for limit orders")
         
-        data = {
-            "CANO": acct_no[:8],
-            "ACNT_PRDT_CD": acct_no[8:],
-            "PDNO": symbol,
-            "ORD_DVSN": order_type,
-            "ORD_QTY": str(quantity),
-            "ORD_UNPR": str(price) if price else "0",
-        }
-        
-        if side == "buy":
-            endpoint = "/uapi/domestic-stock/v1/trading/order-cash"
-            tr_id = "TTTC0802U"
-        else:  # sell
-            endpoint = "/uapi/domestic-stock/v1/trading/order-cash"  
-            tr_id = "TTTC0801U"
+        data = template.copy()
+        data["PDNO"] = symbol
+        data["ORD_DVSN"] = order_type
+        data["ORD_QTY"] = _int_str(quantity)
+        data["ORD_UNPR"] = _int_str(price) if price else "0"
         
         return self._make_request(
             "POST",
-            endpoint,
+            endpoint_key,
             data=data,
             tr_id=tr_id
         )
@@ -289,19 +584,150 @@ class KISClient:
             symbol: Stock symbol (6-digit code)
             
         Returns:
-            dict: Current price information
+            dict: Current price information (after attach_websocket, possibly
+                a streamed quote; see there for which fields it carries)
+        """
+        ttl = self._price_cache_ttl
+        if ttl is None:
+            return self._make_request(**self._price_request(symbol))
+        
+        cached = self._cached_price(symbol, ttl)
+        if cached is None:
+            cached = self._make_request(**self._price_request(symbol))
+            self._price_cache[symbol] = (time.monotonic(), cached)
+        return cached
+    
+    async def get_current_price_async(self, symbol: str) -> Dict[str, Any]:
+        """Async version of get_current_price"""
+        ttl = self._price_cache_ttl
+        if ttl is None:
+            return await self._make_request_async(**self._price_request(symbol))
+        
+        cached = self._cached_price(symbol, ttl)
+        if cached is None:
+            cached = await self._make_request_async(**self._price_request(symbol))
+            self._price_cache[symbol] = (time.monotonic(), cached)
+        return cached
+    
+    async def attach_websocket(
+        self,
+        ws_client: "KISWebSocket",
+        symbols: List[str],
+        max_age: float = 1.0,
+        callback: Optional[Callable] = None
+    ) -> bool:
+        """
+        Serve get_current_price from a real-time WebSocket price feed
+        
+        Subscribes to real-time prices for symbols; while updates keep
+        arriving, price lookups for them are answered from memory. Quotes
+        older than max_age seconds (or for other symbols) are fetched over
+        REST and cached for the same period.
+        
+        Each update overwrites the price, change, change rate and volume of
+        the symbol's cached quote and keeps the other fields of the last REST
+        response; a symbol never fetched over REST has only those fields.
+        
+        Args:
+            ws_client: Connected KISWebSocket client
+            symbols: Stock symbols to stream (6-digit codes)
+            max_age: Maximum quote age in seconds served from cache (default: 1.0)
+            callback: Optional callback (plain or async) also receiving each
+                price update
+            
+        Returns:
+            bool: True if subscription successful
+        """
+        def on_price_update(data: "PriceTick"):
+            self._store_streamed_price(data)
+            if callback:
+                return callback(data)
+            return None
+        
+        self._price_cache_ttl = max_age
+        return await ws_client.subscribe_price(symbols, on_price_update)
+    
+    def _cached_price(self, symbol: str, ttl: float) -> Optional[Dict[str, Any]]:
+        """Return a cached quote if it is younger than ttl seconds"""
+        entry = self._price_cache.get(symbol)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        return None
+    
+    def _store_streamed_price(self, tick: "PriceTick"):
+        """Merge a WebSocket price update into the symbol's cached quote"""
+        entry = self._price_cache.get(tick.symbol)
+        if entry is not None:
+            response = dict(entry[1])
+            output = dict(response.get("output") or {})
+        else:
+            response = {"rt_cd": "0", "msg1": ""}
+            output = {}
+        output["stck_shrn_iscd"] = tick.symbol
+        output["stck_prpr"] = str(tick.price)
+        output["prdy_vrss"] = str(tick.change)
+        output["prdy_ctrt"] = f"{tick.change_rate:.2f}"
+        output["acml_vol"] = str(tick.volume)
+        
+        # New dicts per update: earlier responses may be held by callers
+        response["output"] = output
+        self._price_cache[tick.symbol] = (time.monotonic(), response)
+    
+    def get_current_prices(
+        self,
+        symbols: List[str],
+        max_workers: int = 8
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get current stock prices for several symbols concurrently
+        
+        KIS has no batch quote endpoint, so one request per symbol is issued
+        from a thread pool of at most max_workers threads.
+        
+        Args:
+            symbols: Stock symbols (6-digit codes)
+            max_workers: Maximum number of concurrent requests (default: 8)
+            
+        Returns:
+            dict: Current price information keyed by symbol, in input order
         """
+        unique_symbols = list(dict.fromkeys(symbols))
+        if not unique_symbols:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_symbols))) as executor:
+            results = executor.map(self.get_current_price, unique_symbols)
+            return dict(zip(unique_symbols, results))
+    
+    async def get_current_prices_async(
+        self,
+        symbols: List[str],
+        max_concurrency: int = 8
+    ) -> Dict[str, Dict[str, Any]]:
+        """Async version of get_current_prices, bounded by a semaphore"""
+        unique_symbols = list(dict.fromkeys(symbols))
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def fetch(symbol: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_current_price_async(symbol)
+        
+        results = await asyncio.gather(*(fetch(symbol) for symbol in unique_symbols))
+        return dict(zip(unique_symbols, results))
+    
+    def _price_request(self, symbol: str) -> Dict[str, Any]:
+        """Build the request arguments for get_current_price"""
         params = {
             "FID_COND_MRKT_DIV_CODE": "J",  # Market division
             "FID_INPUT_ISCD": symbol,
         }
         
-        return self._make_request(
-            "GET",
-            "/uapi/domestic-stock/v1/quotations/inquire-price",
-            params=params,
-            tr_id="FHKST01010100"
-        )
+        return {
+            "method": "GET",
+            "endpoint_key": "price",
+            "params": params,
+            "tr_id": _TR_IDS["price"]
+        }
     
     def get_order_history(
         self,
@@ -320,33 +746,41 @@ class KISClient:
         Returns:
             dict: Order history
         """
-        acct_no = account_number or self.account_number
-        if not acct_no:
-            raise ValueError("Account number is required")
-        
+        return self._make_request(
+            **self._order_history_request(start_date, end_date, account_number)
+        )
+    
+    async def get_order_history_async(
+        self,
+        start_date: str,
+        end_date: str,
+        account_number: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Async version of get_order_history"""
+        return await self._make_request_async(
+            **self._order_history_request(start_date, end_date, account_number)
+        )
+    
+    def _order_history_request(
+        self,
+        start_date: str,
+        end_date: str,
+        account_number: Optional[str]
+    ) -> Dict[str, Any]:
+        """Build the request arguments for get_order_history"""
         params = {
-            "CANO": acct_no[:8],
-            "ACNT_PRDT_CD": acct_no[8:],
+            **self._account_fields(account_number),
             "INQR_STRT_DT": start_date,
             "INQR_END_DT": end_date,
-            "SLL_BUY_DVSN_CD": "00",  # All orders
-            "INQR_DVSN": "00",
-            "PDNO": "",
-            "CCLD_DVSN": "00",
-            "ORD_GNO_BRNO": "",
-            "ODNO": "",
-            "INQR_DVSN_3": "00",
-            "INQR_DVSN_1": "",
-            "CTX_AREA_FK100": "",
-            "CTX_AREA_NK100": ""
+            **_ORDER_HISTORY_PARAMS
         }
         
-        return self._make_request(
-            "GET", 
-            "/uapi/domestic-stock/v1/trading/inquire-daily-ccld",
-            params=params,
-            tr_id="TTTC8001R"
-        )
+        return {
+            "method": "GET",
+            "endpoint_key": "order_history",
+            "params": params,
+            "tr_id": _TR_IDS["order_history"]
+        }
     
     def cancel_order(self, order_number: str, account_number: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -359,30 +793,15 @@ class KISClient:
         Returns:
             dict: Cancellation result
         """
-        acct_no = account_number or self.account_number
-        if not acct_no:
-            raise ValueError("Account number is required")
-        
         data = {
-            "CANO": acct_no[:8],
-            "ACNT_PRDT_CD": acct_no[8:],
-            "KRX_FWDG_ORD_ORGNO": "",
+            **self._account_fields(account_number),
             "ORGN_ODNO": order_number,
-            "ORD_DVSN": "00",
-            "RVSE_CNCL_DVSN_CD": "02",  # Cancel
-            "ORD_QTY": "0",
-            "ORD_UNPR": "0",
-            "QTY_ALL_ORD_YN": "Y"  # Cancel all quantity
+            **_CANCEL_ORDER_DATA
         }
         
         return self._make_request(
             "POST",
-            "/uapi/domestic-stock/v1/trading/order-rvsecncl",
+            "order_revise_cancel",
             data=data,
-            tr_id="TTTC0803U"
+            tr_id=_TR_IDS["cancel"]
         )
-    
-    def __del__(self):
-        """Clean up resources"""
-        if hasattr(self, 'session'):
-            self.session.close()
\ No newline at end of file
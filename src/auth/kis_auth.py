@@ -7,14 +7,36 @@ Manages access tokens, refresh tokens, and authentication state.
 """
 
 import requests
+import hashlib
+import json
+import os
+import threading
 import time
-from typing import Optional, Dict, Any
+import weakref
+from concurrent.futures import Future
+from pathlib import Path
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping
 from datetime import datetime, timedelta
 import logging
 
+from ..utils import fastjson
+from ..utils.http import create_session
+
 logger = logging.getLogger(__name__)
 
 
+def _background_refresh(auth_ref: "weakref.ref[KISAuth]"):
+    """Timer callback refreshing a token ahead of expiry"""
+    auth = auth_ref()
+    if auth is None:
+        return
+    
+    logger.info("Refreshing access token ahead of expiry")
+    if not auth.authenticate(force=True):
+        logger.warning("Background token refresh failed; will retry on next request")
+
+
 class KISAuth:
     """
     Korean Investment & Securities Authentication Client
@@ -22,6 +44,15 @@ class KISAuth:
     Handles OAuth2 token management for KIS OpenAPI access.
     """
     
+    __slots__ = (
+        "app_key", "app_secret", "is_mock", "auto_refresh", "refresh_ratio",
+        "base_url", "access_token", "token_type", "expires_at", "issued_at",
+        "expires_in", "_refresh_due", "_auth_headers", "_auth_lock",
+        "_auth_inflight", "_refresh_timer", "_owns_session", "session",
+        "_session_finalizer", "token_cache_path",
+        "__weakref__"  # Refresh timer and session finalizer hold weak references
+    )
+    
     # API Endpoints
     PROD_BASE_URL = "https://openapi.koreainvestment.com:9443"
     MOCK_BASE_URL = "https://openapimock.koreainvestment.com:9443"
@@ -29,12 +60,18 @@ class KISAuth:
     TOKEN_ENDPOINT = "/oauth2/tokenP"
     REVOKE_ENDPOINT = "/oauth2/revokeP"
     
+    # Directory for tokens persisted across process restarts
+    TOKEN_CACHE_DIR = Path.home() / ".kis"
+    
     def __init__(
         self,
         app_key: str,
         app_secret: str,
         is_mock: bool = True,
-        auto_refresh: bool = True
+        auto_refresh: bool = True,
+        session: Optional[requests.Session] = None,
+        refresh_ratio: float = 0.75,
+        cache_token: bool = True
     ):
         """
         Initialize KIS Authentication client
@@ -44,11 +81,17 @@ class KISAuth:
             app_secret: Application secret from KIS  
             is_mock: Use mock environment (default: True)
             auto_refresh: Automatically refresh expired tokens (default: True)
+            session: HTTP session to share with other clients (optional)
+            refresh_ratio: Fraction of the token lifetime after which it is
+                refreshed (default: 0.75)
+            cache_token: Persist the token under TOKEN_CACHE_DIR and reuse
+                it in later processes (default: True)
         """
         self.app_key = app_key
         self.app_secret = app_secret
         self.is_mock = is_mock
         self.auto_refresh = auto_refresh
+        self.refresh_ratio = refresh_ratio
         
         self.base_url = self.MOCK_BASE_URL if is_mock else self.PROD_BASE_URL
         
@@ -56,20 +99,86 @@ class KISAuth:
         self.access_token: Optional[str] = None
         self.token_type: Optional[str] = None
         self.expires_at: Optional[datetime] = None
+        self.issued_at: Optional[datetime] = None
+        self.expires_in: Optional[int] = None
+        # Monotonic deadline after which the token is due for refresh;
+        # the datetime fields above are kept for display and persistence
+        self._refresh_due = 0.0
+        
+        # Auth headers for the current token, built on first use
+        self._auth_headers: Optional[Mapping[str, str]] = None
+        
+        # Token requests are single-flight: concurrent authenticate() calls
+        # share the result of the one request in progress
+        self._auth_lock = threading.Lock()
+        self._auth_inflight: Optional[Future] = None
         
-        # Session for connection pooling
-        self.session = requests.Session()
+        # Proactive refresh
+        self._refresh_timer: Optional[threading.Timer] = None
         
-    def authenticate(self) -> bool:
+        # Session for connection pooling (only closed here if created here)
+        self._owns_session = session is None
+        self.session = session if session is not None else create_session()
+        # Safety net if close() is never called; not tied to __del__/GC order
+        self._session_finalizer = weakref.finalize(
+            self, self.session.close if self._owns_session else lambda: None
+        )
+        
+        # Token file keyed by app key and environment (mock/prod tokens differ)
+        self.token_cache_path: Optional[Path] = None
+        if cache_token:
+            cache_key = hashlib.sha256(f"{app_key}@{self.base_url}".encode()).hexdigest()[:16]
+            self.token_cache_path = self.TOKEN_CACHE_DIR / f"{cache_key}.json"
+            self._load_cached_token()
+        
+    def authenticate(self, force: bool = False) -> bool:
         """
         Authenticate with KIS OpenAPI and obtain access token
         
+        A still-valid token (e.g. one loaded from the token cache) is reused
+        unless force is set. Concurrent callers are coalesced: only one token
+        request is sent and every caller receives its result.
+        
+        Args:
+            force: Request a new token even if the current one is still
+                valid (default: False)
+        
         Returns:
             bool: True if authentication successful, False otherwise
+        """
+        with self._auth_lock:
+            if not force and self.is_token_valid():
+                return True
             
-        Raises:
-            requests.RequestException: If API request fails
-            ValueError: If invalid credentials or response
+            inflight = self._auth_inflight
+            if inflight is None:
+                inflight = self._auth_inflight = Future()
+                is_leader = True
+            else:
+                is_leader = False
+        
+        if not is_leader:
+            return inflight.result()
+        
+        try:
+            success = self._request_token()
+        except BaseException as e:
+            with self._auth_lock:
+                self._auth_inflight = None
+            inflight.set_exception(e)
+            raise
+        
+        with self._auth_lock:
+            self._auth_inflight = None
+        inflight.set_result(success)
+        return success
+    
+    def _request_token(self) -> bool:
+        """
+        Request a new access token from the token endpoint
+        
+        Returns:
+            bool: True if authentication successful, False otherwise
         """
         try:
             url = f"{self.base_url}{self.TOKEN_ENDPOINT}"
@@ -84,75 +193,199 @@ class KISAuth:
                 "appsecret": self.app_secret
             }
             
-            logger.info(f"Attempting authentication with KIS API at {url}")
+            logger.info("Attempting authentication with KIS API at %s", url)
             
-            response = self.session.post(url, json=data, headers=headers, timeout=30)
+            response = self.session.post(url, data=fastjson.dumps(data), headers=headers, timeout=30)
             response.raise_for_status()
             
-            token_data = response.json()
+            token_data = fastjson.loads(response.content)
             
             # Validate response
             if not token_data.get("access_token"):
-                logger.error(f"No access token in response: {token_data}")
+                logger.error("No access token in response: %s", token_data)
                 return False
                 
             # Store token information
             self.access_token = token_data["access_token"]
             self.token_type = token_data.get("token_type", "Bearer")
+            self._auth_headers = None
             
             # Calculate expiry time (default 24 hours if not provided)
-            expires_in = token_data.get("expires_in", 86400)  # 24 hours
-            self.expires_at = datetime.now() + timedelta(seconds=expires_in)
+            expires_in = int(token_data.get("expires_in", 86400))  # 24 hours
+            self.issued_at = datetime.now()
+            self.expires_in = expires_in
+            self.expires_at = self.issued_at + timedelta(seconds=expires_in)
+            self._refresh_due = time.monotonic() + expires_in * self.refresh_ratio
+            
+            if self.auto_refresh:
+                self._schedule_refresh(expires_in * self.refresh_ratio)
+            
+            self._save_cached_token()
             
             logger.info("Authentication successful")
-            logger.debug(f"Token expires at: {self.expires_at}")
+            logger.debug("Token expires at: %s", self.expires_at)
             
             return True
             
         except requests.RequestException as e:
-            logger.error(f"Authentication request failed: {e}")
+            logger.error("Authentication request failed: %s", e)
             return False
         except (KeyError, ValueError) as e:
-            logger.error(f"Invalid authentication response: {e}")
+            logger.error("Invalid authentication response: %s", e)
             return False
     
+    def _load_cached_token(self):
+        """Restore a still-valid token persisted by an earlier process"""
+        try:
+            with open(self.token_cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+            access_token = cached["access_token"]
+            token_type = cached.get("token_type", "Bearer")
+            issued_at = datetime.fromisoformat(cached["issued_at"])
+            expires_in = int(cached["expires_in"])
+        except FileNotFoundError:
+            return
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            logger.warning("Ignoring unreadable token cache %s: %s", self.token_cache_path, e)
+            return
+        
+        remaining = expires_in * self.refresh_ratio - (datetime.now() - issued_at).total_seconds()
+        if remaining <= 0:
+            return
+        
+        self.access_token = access_token
+        self.token_type = token_type
+        self._auth_headers = None
+        self.issued_at = issued_at
+        self.expires_in = expires_in
+        self.expires_at = issued_at + timedelta(seconds=expires_in)
+        self._refresh_due = time.monotonic() + remaining
+        
+        if self.auto_refresh:
+            self._schedule_refresh(remaining)
+        
+        logger.info("Reusing cached access token")
+        logger.debug("Token expires at: %s", self.expires_at)
+    
+    def _save_cached_token(self):
+        """Persist the current token atomically with owner-only permissions"""
+        if self.token_cache_path is None:
+            return
+        
+        cached = {
+            "access_token": self.access_token,
+            "token_type": self.token_type,
+            "issued_at": self.issued_at.isoformat(),
+            "expires_in": self.expires_in,
+            "expires_at": self.expires_at.isoformat()
+        }
+        
+        tmp_path = self.token_cache_path.with_name(self.token_cache_path.name + ".tmp")
+        try:
+            self.token_cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(cached, f)
+            os.replace(tmp_path, self.token_cache_path)
+        except OSError as e:
+            logger.warning("Failed to persist access token: %s", e)
+    
+    def _remove_cached_token(self):
+        """Delete the persisted token, if any"""
+        if self.token_cache_path is None:
+            return
+        try:
+            self.token_cache_path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Failed to remove cached token: %s", e)
+    
+    def _clear_token(self):
+        """Forget the current token in memory and on disk"""
+        self._cancel_refresh()
+        self.access_token = None
+        self.token_type = None
+        self._auth_headers = None
+        self.expires_at = None
+        self.issued_at = None
+        self.expires_in = None
+        self._refresh_due = 0.0
+        self._remove_cached_token()
+    
+    def invalidate_token(self, rejected_token: Optional[str] = None):
+        """
+        Discard a token the server rejected
+        
+        Args:
+            rejected_token: Token that was rejected. If another caller has
+                already replaced it, the current token is kept.
+        """
+        with self._auth_lock:
+            if rejected_token is None or rejected_token == self.access_token:
+                logger.info("Discarding rejected access token")
+                self._clear_token()
+    
+    def _schedule_refresh(self, delay: float):
+        """Schedule a background token refresh after delay seconds"""
+        self._cancel_refresh()
+        
+        # Weak reference so a pending timer does not keep this client alive
+        self._refresh_timer = threading.Timer(
+            delay, _background_refresh, args=(weakref.ref(self),)
+        )
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+    
+    def _cancel_refresh(self):
+        """Cancel a pending background token refresh"""
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+    
     def is_token_valid(self) -> bool:
         """
-        Check if current access token is valid and not expired
+        Check if current access token is valid and not due for refresh
+        
+        A token is due for refresh once refresh_ratio of its lifetime
+        has elapsed.
         
         Returns:
             bool: True if token is valid, False otherwise
         """
-        if not self.access_token or not self.expires_at:
-            return False
-            
-        # Check if token expires within next 5 minutes
-        buffer_time = timedelta(minutes=5)
-        return datetime.now() < (self.expires_at - buffer_time)
+        return bool(self.access_token) and time.monotonic() < self._refresh_due
     
-    def get_auth_headers(self) -> Dict[str, str]:
+    def get_auth_headers(self) -> Mapping[str, str]:
         """
         Get authorization headers for API requests
         
+        The mapping is read-only and shared until the token changes; copy
+        it before adding request-specific headers.
+        
         Returns:
-            dict: Headers with authorization token
+            Mapping: Headers with authorization token
             
         Raises:
             ValueError: If no valid token available
         """
         if self.auto_refresh and not self.is_token_valid():
             logger.info("Token expired or invalid, attempting refresh")
-            if not self.authenticate():
+            # Not forced: another caller may have refreshed in the meantime
+            if not self.authenticate(force=False):
                 raise ValueError("Failed to refresh authentication token")
         
-        if not self.access_token:
-            raise ValueError("No valid access token available")
+        headers = self._auth_headers
+        if headers is None:
+            if not self.access_token:
+                raise ValueError("No valid access token available")
             
-        return {
-            "Authorization": f"{self.token_type} {self.access_token}",
-            "appkey": self.app_key,
-            "appsecret": self.app_secret
-        }
+            headers = self._auth_headers = MappingProxyType({
+                "Authorization": f"{self.token_type} {self.access_token}",
+                "appkey": self.app_key,
+                "appsecret": self.app_secret
+            })
+        
+        return headers
     
     def revoke_token(self) -> bool:
         """
@@ -178,22 +411,26 @@ class KISAuth:
                 "token": self.access_token
             }
             
-            response = self.session.post(url, json=data, headers=headers, timeout=30)
+            response = self.session.post(url, data=fastjson.dumps(data), headers=headers, timeout=30)
             response.raise_for_status()
             
             # Clear stored token data
-            self.access_token = None
-            self.token_type = None
-            self.expires_at = None
+            self._clear_token()
             
             logger.info("Token revoked successfully")
             return True
             
         except requests.RequestException as e:
-            logger.error(f"Token revocation failed: {e}")
+            logger.error("Token revocation failed: %s", e)
             return False
     
-    def __del__(self):
-        """Clean up resources"""
-        if hasattr(self, 'session'):
-            self.session.close()
\ No newline at end of file
+    def close(self):
+        """Stop background refresh and close the HTTP session if owned"""
+        self._cancel_refresh()
+        self._session_finalizer()
+    
+    def __enter__(self) -> "KISAuth":
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
\ No newline at end of file
@@ -8,6 +8,7 @@ from .exceptions import (
     KISConfigError,
     KISStrategyError
 )
+from .http import KeepAliveAdapter, create_session, create_async_session
 
 __all__ = [
     'KISError',
@@ -15,5 +16,8 @@ __all__ = [
     'KISAPIError', 
     'KISWebSocketError',
     'KISConfigError',
-    'KISStrategyError'
+    'KISStrategyError',
+    'KeepAliveAdapter',
+    'create_session',
+    'create_async_session'
 ]
\ No newline at end of file
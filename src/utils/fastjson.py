@@ -0,0 +1,48 @@
+"""
+Korean Investment & Securities JSON Utilities
+=============================================
+
+JSON encoding/decoding for API payloads. Uses orjson when installed
+(``pip install korea-investment-trading[fast]``) and falls back to the
+standard library otherwise.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+
+def loads(data):
+    """
+    Decode JSON from bytes or str
+    
+    Args:
+        data: Raw JSON payload
+        
+    Returns:
+        Decoded Python object
+    
+    Raises:
+        ValueError: If the payload is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> bytes:
+    """
+    Encode an object as compact UTF-8 JSON
+    
+    Args:
+        obj: Object to serialize
+        
+    Returns:
+        bytes: Encoded JSON payload
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
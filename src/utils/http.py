@@ -0,0 +1,110 @@
+"""
+Korean Investment & Securities HTTP Utilities
+=============================================
+
+Shared HTTP session setup for the KIS REST clients.
+"""
+
+import socket
+from typing import TYPE_CHECKING
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+if TYPE_CHECKING:
+    import aiohttp
+
+# Connection pool sizing for HTTPS sessions
+POOL_CONNECTIONS = 8
+POOL_MAXSIZE = 32
+
+# Transient failures retried inside urllib3. Only idempotent requests are
+# retried on read errors or error statuses: re-sending an order POST whose
+# response was lost could place it twice. Connection failures are retried
+# for every method since nothing reached the server. 500 is not retried:
+# KIS reports an expired token (EGW00123) with it, which the client handles
+# by re-authenticating.
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+RETRY_METHODS = frozenset(["GET"])
+
+# Async connection pool: every request goes to a single KIS host, so the
+# per-host limit is the effective concurrency. Idle sockets are kept long
+# enough to survive gaps between polling bursts without a new TLS handshake.
+ASYNC_POOL_LIMIT = 32
+ASYNC_KEEPALIVE_TIMEOUT = 60
+DNS_CACHE_TTL = 300
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose sockets disable Nagle and enable TCP keep-alive
+    
+    TCP_NODELAY keeps small order/auth POSTs from waiting on delayed ACKs;
+    SO_KEEPALIVE lets the OS detect dead pooled connections between polls.
+    """
+    
+    # urllib3's defaults already carry TCP_NODELAY; keep them explicitly
+    SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    ]
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("socket_options", list(self.SOCKET_OPTIONS))
+        super().init_poolmanager(*args, **kwargs)
+
+
+def create_session() -> requests.Session:
+    """
+    Create an HTTP session with connection pooling for KIS OpenAPI
+    
+    Returns:
+        requests.Session: Session with a pooled, retrying HTTPS adapter mounted
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        connect=3,
+        read=2,
+        status=3,
+        backoff_factor=0.25,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=RETRY_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False  # Return the last response for normal error handling
+    )
+    adapter = KeepAliveAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=retry
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+def create_async_session(timeout: float) -> "aiohttp.ClientSession":
+    """
+    Create an aiohttp session with a keep-alive connection pool for KIS OpenAPI
+    
+    Must be called from within a running event loop.
+    
+    Args:
+        timeout: Total request timeout in seconds
+        
+    Returns:
+        aiohttp.ClientSession: Session sharing pooled connections across requests
+    """
+    # aiohttp is only loaded once an async session is needed
+    import aiohttp
+    
+    connector = aiohttp.TCPConnector(
+        limit=ASYNC_POOL_LIMIT,
+        limit_per_host=ASYNC_POOL_LIMIT,
+        keepalive_timeout=ASYNC_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL
+    )
+    return aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        connector=connector
+    )
@@ -1,5 +1,6 @@
 """WebSocket module for Korean Investment & Securities real-time data"""
 
 from .kis_websocket import KISWebSocket, SubscriptionType
+from .kis_parsers import PriceTick, OrderbookTick, RawTick
 
-__all__ = ['KISWebSocket', 'SubscriptionType']
\ No newline at end of file
+__all__ = ['KISWebSocket', 'SubscriptionType', 'PriceTick', 'OrderbookTick', 'RawTick']
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""
+KIS Real-time Record Parsers
+============================
+
+Typed records for real-time market data and the parsers building them from
+the "^"-separated fields of one real-time record.
+
+The module is self-contained and mypyc-compatible; compiling it, e.g. with
+``mypyc src/websocket/kis_parsers.py`` from the repository root, places an
+extension module next to this file that Python imports in its place.
+"""
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Dict, List, NamedTuple, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class PriceTick(NamedTuple):
+    """Real-time price update (H0STCNT0)"""
+    symbol: str
+    price: int
+    change: int
+    change_rate: float
+    volume: int
+    timestamp: datetime
+
+
+class OrderbookTick(NamedTuple):
+    """Real-time orderbook update (H0STASP0), levels 1-10 as int64 arrays"""
+    symbol: str
+    buy_prices: "np.ndarray"
+    buy_volumes: "np.ndarray"
+    sell_prices: "np.ndarray"
+    sell_volumes: "np.ndarray"
+    timestamp: datetime
+
+
+class RawTick(NamedTuple):
+    """Update for a TR ID without a dedicated parser"""
+    tr_id: str
+    fields: List[str]
+    timestamp: datetime
+
+
+MarketData = Union[PriceTick, OrderbookTick, RawTick]
+
+
+# Field positions in real-time records; the symbol is always field 0.
+# H0STCNT0: price, change, change rate, accumulated volume
+_PRICE_FIELD = 2
+_CHANGE_FIELD = 4
+_CHANGE_RATE_FIELD = 5
+_VOLUME_FIELD = 13
+# H0STASP0: ask prices 1-10, bid prices 1-10, ask volumes 1-10 and
+# bid volumes 1-10 in one contiguous run
+_ORDERBOOK_FIELDS = slice(3, 43)
+
+
+def parse_price(fields: List[str], timestamp: datetime) -> PriceTick:
+    """Parse a real-time price record (H0STCNT0)"""
+    return PriceTick(
+        fields[0],
+        int(fields[_PRICE_FIELD]),
+        int(fields[_CHANGE_FIELD]),
+        float(fields[_CHANGE_RATE_FIELD]),
+        int(fields[_VOLUME_FIELD]),
+        timestamp
+    )
+
+
+def parse_orderbook(fields: List[str], timestamp: datetime) -> OrderbookTick:
+    """Parse a real-time orderbook record (H0STASP0)"""
+    # numpy is only needed once an orderbook arrives
+    import numpy as np
+    
+    # One int64 array for all 40 values; each side is a view into it
+    levels = np.array(fields[_ORDERBOOK_FIELDS], dtype=np.int64)
+    if len(levels) != 40:
+        raise ValueError(f"expected 40 orderbook fields, got {len(levels)}")
+    return OrderbookTick(
+        fields[0],
+        levels[10:20],
+        levels[30:40],
+        levels[0:10],
+        levels[20:30],
+        timestamp
+    )
+
+
+# Record parsers by TR ID
+PARSERS: Dict[str, Callable[[List[str], datetime], MarketData]] = {
+    "H0STCNT0": parse_price,
+    "H0STASP0": parse_orderbook,
+}
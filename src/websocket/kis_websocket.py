@@ -8,19 +8,37 @@ Supports real-time price, orderbook, and trading data.
 
 import asyncio
 import websockets
-import json
 import logging
-from typing import Dict, List, Optional, Callable, Any
+import random
+from typing import Deque, Dict, List, Optional, Callable, Tuple, Union
 from datetime import datetime
 import threading
 import time
+from collections import deque
 from enum import Enum
 
+try:
+    import uvloop  # Optional: faster event loop for the background thread
+except ImportError:
+    uvloop = None
+
 from ..auth.kis_auth import KISAuth
 from ..utils.exceptions import KISWebSocketError
+from ..utils import fastjson
+from .kis_parsers import PARSERS, MarketData, RawTick
 
 logger = logging.getLogger(__name__)
 
+# Pre-serialized subscription frames: approval key (JSON-encoded), tr_id, tr_key
+_SUBSCRIBE_FRAME = (
+    '{"header":{"approval_key":%s,"custtype":"P","tr_type":"1","content-type":"utf-8"},'
+    '"body":{"input":{"tr_id":"%s","tr_key":"%s"}}}'
+)
+_UNSUBSCRIBE_FRAME = (
+    '{"header":{"approval_key":%s,"custtype":"P","tr_type":"2","content-type":"utf-8"},'
+    '"body":{"input":{"tr_id":"%s","tr_key":"%s"}}}'
+)
+
 
 class SubscriptionType(Enum):
     """WebSocket subscription types"""
@@ -40,6 +58,19 @@ class KISWebSocket:
     PROD_WS_URL = "ws://ops.koreainvestment.com:21000"
     MOCK_WS_URL = "ws://ops.koreainvestment.com:31000"
     
+    # Reconnect backoff cap in seconds
+    RECONNECT_MAX_DELAY = 60
+    
+    # Parsed updates buffered per subscription; the oldest is dropped when
+    # full, since stale ticks are worth less than latency
+    DISPATCH_BUFFER_SIZE = 128
+    
+    # Frames handled back to back before the receive loop yields
+    RECEIVE_BATCH_SIZE = 64
+    
+    # Record parsers by TR ID; TR IDs without one are delivered as RawTick
+    _PARSERS: Dict[str, Callable[[List[str], datetime], MarketData]] = dict(PARSERS)
+    
     def __init__(
         self,
         app_key: str,
@@ -55,7 +86,8 @@ class KISWebSocket:
             app_key: Application key from KIS
             app_secret: Application secret from KIS
             is_mock: Use mock environment (default: True)
-            ping_interval: Ping interval in seconds (default: 30)
+            ping_interval: Keepalive ping interval in seconds; the connection is
+                closed if a pong takes longer than twice this (default: 30)
             max_reconnect_attempts: Maximum reconnection attempts (default: 5)
         """
         self.auth = KISAuth(app_key, app_secret, is_mock)
@@ -73,12 +105,19 @@ class KISWebSocket:
         self.reconnect_count = 0
         
         # Subscription management
-        self.subscriptions: Dict[str, Dict] = {}
-        self.callbacks: Dict[str, Callable] = {}
+        self.subscriptions: Dict[Tuple[str, str], Dict] = {}
+        self.callbacks: Dict[Tuple[str, str], Callable] = {}
+        
+        # Per-subscription dispatch: the receive loop only buffers updates
+        # and signals, and one worker per subscription runs its callback
+        self._dispatch_buffers: Dict[Tuple[str, str], Tuple[Deque[MarketData], asyncio.Event]] = {}
+        self._dispatch_tasks: Dict[Tuple[str, str], asyncio.Task] = {}
+        
+        # Access token and its JSON encoding for the frame templates
+        self._approval_key: Optional[Tuple[Optional[str], str]] = None
         
         # Background tasks
         self.receive_task: Optional[asyncio.Task] = None
-        self.ping_task: Optional[asyncio.Task] = None
         
         # Threading
         self.loop: Optional[asyncio.AbstractEventLoop] = None
@@ -100,10 +139,12 @@ class KISWebSocket:
             
             logger.info(f"Connecting to WebSocket: {self.ws_url}")
             
-            # Connect to WebSocket
+            # Connect to WebSocket; the library sends keepalive pings and
+            # closes the connection if a pong is not received in time
             self.websocket = await websockets.connect(
                 self.ws_url,
-                ping_interval=None,  # We'll handle pings manually
+                ping_interval=self.ping_interval,
+                ping_timeout=self.ping_interval * 2,
                 close_timeout=10
             )
             
@@ -114,7 +155,6 @@ class KISWebSocket:
             
             # Start background tasks
             self.receive_task = asyncio.create_task(self._receive_messages())
-            self.ping_task = asyncio.create_task(self._ping_loop())
             
             return True
             
@@ -129,11 +169,19 @@ class KISWebSocket:
         
         self.is_connected = False
         
-        # Cancel background tasks
-        if self.receive_task and not self.receive_task.done():
-            self.receive_task.cancel()
-        if self.ping_task and not self.ping_task.done():
-            self.ping_task.cancel()
+        # Cancel background tasks together and wait for them to unwind
+        current = asyncio.current_task()
+        tasks = [
+            task for task in (self.receive_task, *self._dispatch_tasks.values())
+            if task is not None and task is not current
+        ]
+        self.receive_task = None
+        self._dispatch_tasks.clear()
+        self._dispatch_buffers.clear()
+        
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
         
         # Close WebSocket connection
         if self.websocket:
@@ -197,28 +245,12 @@ class KISWebSocket:
             raise KISWebSocketError("WebSocket not connected")
         
         try:
+            approval_key = self._approval_key_json()
+            tr_id = sub_type.value
+            
+            # Store subscription info first so early data finds its callback
             for symbol in symbols:
-                # Create subscription message
-                sub_data = {
-                    "header": {
-                        "approval_key": self.auth.access_token,
-                        "custtype": "P",
-                        "tr_type": "1",  # Subscribe
-                        "content-type": "utf-8"
-                    },
-                    "body": {
-                        "input": {
-                            "tr_id": sub_type.value,
-                            "tr_key": symbol
-                        }
-                    }
-                }
-                
-                # Send subscription request
-                await self.websocket.send(json.dumps(sub_data))
-                
-                # Store subscription info
-                sub_key = f"{sub_type.value}_{symbol}"
+                sub_key = (tr_id, symbol)
                 self.subscriptions[sub_key] = {
                     "type": sub_type,
                     "symbol": symbol,
@@ -227,15 +259,30 @@ class KISWebSocket:
                 
                 if callback:
                     self.callbacks[sub_key] = callback
-                
-                logger.info(f"Subscribed to {sub_type.value} for {symbol}")
-        
+                    self._start_dispatcher(sub_key)
+            
+            # Send all subscription requests together
+            await asyncio.gather(*(
+                self.websocket.send(_SUBSCRIBE_FRAME % (approval_key, tr_id, symbol))
+                for symbol in symbols
+            ))
+            
+            logger.info(f"Subscribed to {tr_id} for {', '.join(symbols)}")
+            
             return True
             
         except Exception as e:
             logger.error(f"Subscription failed: {e}")
             return False
     
+    def _approval_key_json(self) -> str:
+        """Return the approval key encoded as a JSON string for frame templates"""
+        token = self.auth.access_token
+        cached = self._approval_key
+        if cached is None or cached[0] != token:
+            cached = self._approval_key = (token, fastjson.dumps(token).decode("utf-8"))
+        return cached[1]
+    
     async def unsubscribe(self, sub_type: SubscriptionType, symbols: List[str]) -> bool:
         """
         Unsubscribe from real-time data
@@ -251,32 +298,23 @@ class KISWebSocket:
             raise KISWebSocketError("WebSocket not connected")
         
         try:
+            approval_key = self._approval_key_json()
+            tr_id = sub_type.value
+            
+            # Remove from subscriptions
             for symbol in symbols:
-                # Create unsubscription message
-                unsub_data = {
-                    "header": {
-                        "approval_key": self.auth.access_token,
-                        "custtype": "P", 
-                        "tr_type": "2",  # Unsubscribe
-                        "content-type": "utf-8"
-                    },
-                    "body": {
-                        "input": {
-                            "tr_id": sub_type.value,
-                            "tr_key": symbol
-                        }
-                    }
-                }
-                
-                # Send unsubscription request
-                await self.websocket.send(json.dumps(unsub_data))
-                
-                # Remove from subscriptions
-                sub_key = f"{sub_type.value}_{symbol}"
+                sub_key = (tr_id, symbol)
                 self.subscriptions.pop(sub_key, None)
                 self.callbacks.pop(sub_key, None)
-                
-                logger.info(f"Unsubscribed from {sub_type.value} for {symbol}")
+                self._stop_dispatcher(sub_key)
+            
+            # Send all unsubscription requests together
+            await asyncio.gather(*(
+                self.websocket.send(_UNSUBSCRIBE_FRAME % (approval_key, tr_id, symbol))
+                for symbol in symbols
+            ))
+            
+            logger.info(f"Unsubscribed from {tr_id} for {', '.join(symbols)}")
             
             return True
             
@@ -287,131 +325,200 @@ class KISWebSocket:
     async def _receive_messages(self):
         """Background task to receive and process WebSocket messages"""
         try:
-            while self.is_connected and self.websocket:
-                try:
-                    # Receive message with timeout
-                    message = await asyncio.wait_for(
-                        self.websocket.recv(), 
-                        timeout=60  # 60 second timeout
-                    )
-                    
-                    # Process message
-                    await self._process_message(message)
-                    
-                except asyncio.TimeoutError:
-                    logger.warning("WebSocket receive timeout")
-                    continue
-                except websockets.exceptions.ConnectionClosed:
-                    logger.warning("WebSocket connection closed")
-                    break
+            # Frames the socket has already buffered are returned without
+            # suspending, so a burst is drained in one pass; yield every
+            # RECEIVE_BATCH_SIZE frames so the dispatch workers get to run.
+            # Dead peers are detected by keepalive pings, which close the
+            # connection and end the iteration
+            batched = 0
+            async for message in self.websocket:
+                self._process_message(message, datetime.now())
                 
+                batched += 1
+                if batched >= self.RECEIVE_BATCH_SIZE:
+                    batched = 0
+                    await asyncio.sleep(0)
+            
+            logger.warning("WebSocket connection closed")
+            
+        except asyncio.CancelledError:
+            # Cancelled by disconnect or loop shutdown: close the socket
+            # and propagate instead of treating it as a lost connection
+            if self.websocket is not None:
+                await self.websocket.close()
+            raise
+        except websockets.exceptions.ConnectionClosed:
+            logger.warning("WebSocket connection closed")
         except Exception as e:
             logger.error(f"Message receiving error: {e}")
-        finally:
-            if self.is_connected:
-                # Connection lost, attempt reconnect
-                await self._reconnect()
+        
+        if self.is_connected:
+            # Connection lost, attempt reconnect
+            await self._reconnect()
     
-    async def _process_message(self, message: str):
-        """Process received WebSocket message"""
+    def _process_message(self, message: Union[str, bytes], received_at: datetime):
+        """
+        Process received WebSocket message
+        
+        Real-time data arrives as "<encrypted>|<tr_id>|<count>|<fields>",
+        with the fields of all records joined by "^"; only control frames
+        (subscription replies, PINGPONG) are JSON.
+        
+        Args:
+            message: Raw message frame
+            received_at: Receive time, used as the timestamp of parsed updates
+        """
+        # A bad frame is logged and dropped; it must never end the receive loop
         try:
-            data = json.loads(message)
+            if isinstance(message, bytes):
+                message = message.decode()
             
-            # Extract header and body
-            header = data.get("header", {})
-            body = data.get("body", {})
+            if message[:1] in ("0", "1"):
+                self._process_realtime(message, received_at)
+            else:
+                self._process_control(message)
+        except (ValueError, IndexError, AttributeError) as e:
+            logger.error(f"Malformed message: {e}")
+    
+    def _process_realtime(self, message: str, received_at: datetime):
+        """Split a real-time frame into records and hand each to its worker"""
+        parts = message.split("|", 3)
+        if len(parts) != 4:
+            logger.error(f"Malformed real-time message: {message[:64]}")
+            return
+        
+        encrypted, tr_id, count, data = parts
+        if encrypted == "1":
+            # Encrypted TRs (execution notices) need the subscription's AES key
+            logger.debug(f"Skipping encrypted {tr_id} message")
+            return
+        
+        fields = data.split("^")
+        try:
+            records = int(count)
+            size = len(fields) // records
+        except (ValueError, ZeroDivisionError):
+            records = size = 0
+        if size <= 0 or len(fields) % records:
+            logger.error(f"Malformed {tr_id} record count: {count}")
+            return
+        
+        for start in range(0, len(fields), size):
+            record = fields[start:start + size]
             
-            tr_id = header.get("tr_id", "")
-            tr_key = body.get("tr_key", "")
+            # Find matching subscription and hand off to its worker
+            dispatch = self._dispatch_buffers.get((tr_id, record[0]))
+            if dispatch is None:
+                logger.debug(f"No callback for {tr_id}_{record[0]}")
+                continue
             
-            # Find matching subscription and callback
-            sub_key = f"{tr_id}_{tr_key}"
+            try:
+                parsed_data = self._parse_market_data(tr_id, record, received_at)
+            except (ValueError, IndexError) as e:
+                logger.error(f"Malformed {tr_id} message: {e}")
+                continue
             
-            if sub_key in self.callbacks:
-                callback = self.callbacks[sub_key]
-                
-                # Call callback with processed data
-                if callback:
-                    try:
-                        # Parse market data based on type
-                        parsed_data = self._parse_market_data(tr_id, body)
-                        callback(parsed_data)
-                    except Exception as e:
-                        logger.error(f"Callback execution failed: {e}")
-            else:
-                logger.debug(f"No callback for {sub_key}")
-                
-        except Exception as e:
-            logger.error(f"Message processing error: {e}")
+            buffer, ready = dispatch
+            buffer.append(parsed_data)
+            ready.set()
     
-    def _parse_market_data(self, tr_id: str, body: Dict) -> Dict[str, Any]:
-        """Parse market data based on TR ID"""
-        
-        if tr_id == "H0STCNT0":  # Real-time price
-            return {
-                "type": "price",
-                "symbol": body.get("mksc_shrn_iscd", ""),
-                "price": int(body.get("stck_prpr", 0)),
-                "change": int(body.get("prdy_vrss", 0)),
-                "change_rate": float(body.get("prdy_vrss_rate", 0)),
-                "volume": int(body.get("acml_vol", 0)),
-                "timestamp": datetime.now()
-            }
-        elif tr_id == "H0STASP0":  # Real-time orderbook
-            return {
-                "type": "orderbook", 
-                "symbol": body.get("mksc_shrn_iscd", ""),
-                "buy_prices": [int(body.get(f"bidp{i}", 0)) for i in range(1, 11)],
-                "buy_volumes": [int(body.get(f"bidp_rsqn{i}", 0)) for i in range(1, 11)],
-                "sell_prices": [int(body.get(f"askp{i}", 0)) for i in range(1, 11)],
-                "sell_volumes": [int(body.get(f"askp_rsqn{i}", 0)) for i in range(1, 11)],
-                "timestamp": datetime.now()
-            }
+    def _process_control(self, message: str):
+        """Log replies to subscription requests and other JSON frames"""
+        try:
+            data = fastjson.loads(message)
+        except ValueError as e:
+            logger.error(f"Malformed control message: {e}")
+            return
+        
+        header = data.get("header") or {}
+        tr_id = header.get("tr_id", "")
+        if tr_id == "PINGPONG":
+            logger.debug("Received PINGPONG")
+            return
+        
+        body = data.get("body") or {}
+        if body.get("rt_cd", "0") != "0":
+            logger.warning(f"{tr_id} request failed: {body.get('msg1', '')}")
         else:
-            return {
-                "type": "unknown",
-                "raw_data": body,
-                "timestamp": datetime.now()
-            }
+            logger.debug(f"{tr_id}: {body.get('msg1', '')}")
     
-    async def _ping_loop(self):
-        """Background task to send periodic ping messages"""
-        try:
-            while self.is_connected and self.websocket:
-                await asyncio.sleep(self.ping_interval)
+    def _start_dispatcher(self, sub_key: Tuple[str, str]):
+        """Start the callback worker for a subscription if not running"""
+        task = self._dispatch_tasks.get(sub_key)
+        if task is not None and not task.done():
+            return
+        
+        buffer: Deque[MarketData] = deque(maxlen=self.DISPATCH_BUFFER_SIZE)
+        ready = asyncio.Event()
+        self._dispatch_buffers[sub_key] = (buffer, ready)
+        self._dispatch_tasks[sub_key] = asyncio.create_task(self._dispatch(sub_key, buffer, ready))
+    
+    def _stop_dispatcher(self, sub_key: Tuple[str, str]):
+        """Stop the callback worker for a subscription"""
+        self._dispatch_buffers.pop(sub_key, None)
+        task = self._dispatch_tasks.pop(sub_key, None)
+        if task is not None and not task.done():
+            task.cancel()
+    
+    async def _dispatch(
+        self,
+        sub_key: Tuple[str, str],
+        buffer: Deque[MarketData],
+        ready: asyncio.Event
+    ):
+        """Worker running a subscription's callback for each buffered update"""
+        while True:
+            await ready.wait()
+            ready.clear()
+            
+            while buffer:
+                parsed_data = buffer.popleft()
+                callback = self.callbacks.get(sub_key)
+                if not callback:
+                    continue
                 
-                if self.websocket:
-                    try:
-                        await self.websocket.ping()
-                        logger.debug("WebSocket ping sent")
-                    except Exception as e:
-                        logger.warning(f"WebSocket ping failed: {e}")
-                        break
-                        
-        except Exception as e:
-            logger.error(f"Ping loop error: {e}")
+                try:
+                    result = callback(parsed_data)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    logger.error(f"Callback execution failed: {e}")
+    
+    def _parse_market_data(self, tr_id: str, fields: List[str], timestamp: datetime) -> MarketData:
+        """Parse one real-time record based on TR ID"""
+        parser = self._PARSERS.get(tr_id)
+        if parser is None:
+            return RawTick(tr_id, fields, timestamp)
+        return parser(fields, timestamp)
     
     async def _reconnect(self):
-        """Attempt to reconnect to WebSocket"""
-        if self.reconnect_count >= self.max_reconnect_attempts:
-            logger.error("Maximum reconnection attempts exceeded")
-            return
+        """Attempt to reconnect to WebSocket with exponential backoff"""
+        while self.reconnect_count < self.max_reconnect_attempts:
+            self.reconnect_count += 1
+            logger.info(f"Attempting reconnection {self.reconnect_count}/{self.max_reconnect_attempts}")
+            
+            # Wait before reconnecting; jitter keeps many clients from
+            # reconnecting in lockstep after a shared outage
+            delay = min(2 ** self.reconnect_count, self.RECONNECT_MAX_DELAY)
+            await asyncio.sleep(delay + random.uniform(0, delay / 2))
+            
+            # Attempt reconnection
+            if await self.connect():
+                await self._restore_subscriptions()
+                return
+        
+        logger.error("Maximum reconnection attempts exceeded")
+    
+    async def _restore_subscriptions(self):
+        """Re-send subscriptions, one batch per subscription type and callback"""
+        groups: Dict[Tuple[SubscriptionType, int], Tuple[Optional[Callable], List[str]]] = {}
+        for sub_info in list(self.subscriptions.values()):
+            callback = sub_info.get("callback")
+            group = groups.setdefault((sub_info["type"], id(callback)), (callback, []))
+            group[1].append(sub_info["symbol"])
         
-        self.reconnect_count += 1
-        logger.info(f"Attempting reconnection {self.reconnect_count}/{self.max_reconnect_attempts}")
-        
-        # Wait before reconnecting
-        await asyncio.sleep(min(5 * self.reconnect_count, 60))
-        
-        # Attempt reconnection
-        if await self.connect():
-            # Restore subscriptions
-            for sub_key, sub_info in self.subscriptions.items():
-                await self._subscribe(
-                    sub_info["type"],
-                    [sub_info["symbol"]],
-                    sub_info.get("callback")
-                )
+        for (sub_type, _), (callback, symbols) in groups.items():
+            await self._subscribe(sub_type, symbols, callback)
     
     def start_background_thread(self):
         """Start WebSocket in background thread"""
@@ -420,7 +527,7 @@ class KISWebSocket:
             return
         
         def run_websocket():
-            self.loop = asyncio.new_event_loop()
+            self.loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
             asyncio.set_event_loop(self.loop)
             self.loop.run_until_complete(self.connect())
             self.loop.run_forever()
@@ -436,8 +543,12 @@ class KISWebSocket:
     def stop_background_thread(self):
         """Stop background WebSocket thread"""
         if self.loop and self.loop.is_running():
-            # Schedule disconnect in the loop
-            asyncio.run_coroutine_threadsafe(self.disconnect(), self.loop)
+            # Run disconnect in the loop and let the tasks unwind first
+            future = asyncio.run_coroutine_threadsafe(self.disconnect(), self.loop)
+            try:
+                future.result(timeout=10)
+            except Exception as e:
+                logger.error(f"WebSocket disconnect failed: {e}")
             
             # Stop the loop
             self.loop.call_soon_threadsafe(self.loop.stop)